@@ -0,0 +1,20 @@
+"""
+Environment loading shared by Tower's entry points.
+
+Modules that read configuration at import time call load_env() first, so
+their settings see .env no matter which script was started; the file is
+only read once per process.
+"""
+
+_loaded = False
+
+
+def load_env():
+    """Load .env into os.environ (once - later calls are no-ops)."""
+    global _loaded
+    if _loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _loaded = True
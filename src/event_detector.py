@@ -9,17 +9,40 @@ The hooks integration provides instant notifications instead of 2-second polling
 """
 
 import asyncio
+import atexit
 import json
+import logging
+import logging.handlers
 import os
+import queue
 import re
+import select
+import shlex
+import shutil
 import socket
 import subprocess
+import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Callable, Optional
 
+log = logging.getLogger("tower")
+
+# Optional: libuv-based event loop for the hooks listener
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Optional: faster JSON for hook payloads (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class EventType(Enum):
     ERROR = "error"
@@ -28,54 +51,313 @@ class EventType(Enum):
     NORMAL = "normal"
 
 
-@dataclass
+# How much of the end of raw_output summaries and logs look at
+RAW_TAIL_CHARS = 2000
+
+
+@dataclass(slots=True, frozen=True)
 class DetectedEvent:
     event_type: EventType
     raw_output: str
-    key_lines: list[str]
+    key_lines: tuple[str, ...]
     confidence: float
     timestamp: float
+    # Last RAW_TAIL_CHARS of raw_output, sliced once here rather than by
+    # every consumer (prompt, cache key, interaction log)
+    raw_tail: str = field(init=False, repr=False)
+    # key_lines as the bulleted block the summary prompts embed, with
+    # repeats dropped (first occurrence kept)
+    key_lines_joined: str = field(init=False, repr=False)
 
+    def __post_init__(self):
+        object.__setattr__(self, "raw_tail", self.raw_output[-RAW_TAIL_CHARS:])
+        object.__setattr__(
+            self, "key_lines_joined", "\n".join(f"- {line}" for line in dict.fromkeys(self.key_lines))
+        )
 
-# Pattern matching for common Claude Code events
+
+# Returned for blank panes, the overwhelmingly common no-signal poll, so that
+# case allocates nothing. Shared: callers must not mutate it.
+_EMPTY_NORMAL = DetectedEvent(
+    event_type=EventType.NORMAL,
+    raw_output="",
+    key_lines=(),
+    confidence=1.0,
+    timestamp=0.0,
+)
+
+
+# Pattern matching for common Claude Code events.
+# Compiled once at import - detect_event runs on every poll of every pane.
 ERROR_PATTERNS = [
-    r"FAILED",
-    r"Error:",
-    r"Traceback \(most recent call last\)",
-    r"error\[E\d+\]",  # Rust errors
-    r"npm ERR!",
-    r"exit code [1-9]",
-    r"Command failed",
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"FAILED",
+        r"Error:",
+        r"Traceback \(most recent call last\)",
+        r"error\[E\d+\]",  # Rust errors
+        r"npm ERR!",
+        r"exit code [1-9]",
+        r"Command failed",
+    )
 ]
 
 PERMISSION_PATTERNS = [
-    r"Do you want to",
-    r"Allow\?",
-    r"Proceed\?",
-    r"Continue\?",
-    r"Are you sure",
-    r"\[y/N\]",
-    r"\[Y/n\]",
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"Do you want to",
+        r"Allow\?",
+        r"Proceed\?",
+        r"Continue\?",
+        r"Are you sure",
+        r"\[y/N\]",
+        r"\[Y/n\]",
+    )
 ]
 
 # Patterns indicating agent might be stuck (no progress)
 STUCK_INDICATORS = [
-    r"Waiting for.*response",
-    r"Connection timed out",
-    r"Rate limit exceeded",
-    r"Request failed",
-    r"retrying",
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"Waiting for.*response",
+        r"Connection timed out",
+        r"Rate limit exceeded",
+        r"Request failed",
+        r"retrying",
+    )
 ]
 
+# Each category fused into one alternation so a line is scanned once in C,
+# rather than once per pattern from Python.
+_ERROR_RE = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in ERROR_PATTERNS), re.IGNORECASE
+)
+_PERMISSION_RE = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in PERMISSION_PATTERNS), re.IGNORECASE
+)
+# A finished run, looked for in a pane's last few lines. Only picks the
+# polling tier - it never raises an event.
+_DONE_RE = re.compile(r"complete|done|finished|pushed", re.IGNORECASE)
+
+# Lowercase substrings at least one of which appears in any ERROR_PATTERNS
+# match. Most polls see none of them, and a few C-level `in` checks are far
+# cheaper than running the fused regex over the whole pane.
+_ERROR_KEYWORDS = ("err", "fail", "traceback", "exit code")
+
+# CSI sequences (colors, cursor movement, erase) and OSC sequences (titles,
+# hyperlinks) terminated by BEL or ST.
+_ANSI_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)")
+
 # Default socket path for hooks communication
 DEFAULT_SOCKET_PATH = "/tmp/tower.sock"
 
+# Pending-connection queue for the hooks socket; bursts of hook events
+# shouldn't be refused while the listener is busy.
+HOOKS_BACKLOG = 256
+
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: int | str = logging.INFO):
+    """
+    Route Tower's log output to stderr through a background thread.
+
+    Monitor threads and the hooks event loop only enqueue records; the
+    QueueListener thread does the actual (blocking) stream writes. Call once
+    from an entry point - repeated calls are no-ops.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("[Tower] %(message)s"))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(records, stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    log.addHandler(logging.handlers.QueueHandler(records))
+    log.setLevel(level)
+    log.propagate = False
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it's installed."""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def install_uvloop():
+    """Make uvloop the default event loop policy, when it's installed."""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+class _TmuxControl:
+    """
+    A single long-lived tmux control-mode client (`tmux -C`).
+
+    Forking a tmux client per command dominates the cost of polling panes.
+    In control mode tmux reads one command per line on stdin and frames each
+    reply on stdout between `%begin` and `%end` (or `%error`), so a command
+    becomes a pipe write instead of a process spawn.
+
+    `command()` returns None whenever control mode is unavailable, and
+    callers fall back to running a one-shot tmux subprocess.
+    """
+
+    RETRY_SECONDS = 30.0  # Don't respawn constantly if there's no tmux server
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._replies: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._failed_at = 0.0
+
+    def command(self, *args: str) -> Optional[tuple[bool, str]]:
+        """Run a tmux command. Returns (succeeded, output), or None if unavailable."""
+        replies = self.commands(args)
+        return replies[0] if replies is not None else None
+
+    def commands(self, *commands: tuple[str, ...]) -> Optional[list[tuple[bool, str]]]:
+        """
+        Run several tmux commands with a single pipe write, returning their
+        replies in order, or None if unavailable.
+
+        Each command goes on its own line rather than being joined with
+        `;`: tmux drops the rest of a `;` list after a failing command, but
+        every line always gets exactly one reply.
+        """
+        lines = [" ".join(shlex.quote(arg) for arg in args) for args in commands]
+        if any("\n" in line for line in lines):
+            return None  # Control mode reads exactly one command per line
+
+        with self._lock:
+            if not self._ensure_running():
+                return None
+            replies = []
+            try:
+                self._proc.stdin.write("".join(line + "\n" for line in lines))
+                self._proc.stdin.flush()
+                for _ in lines:
+                    reply = self._replies.get(timeout=self.timeout)
+                    if reply is None:
+                        break
+                    replies.append(reply)
+            except (OSError, ValueError, queue.Empty):
+                pass
+            if len(replies) < len(lines):
+                # Client died or stopped answering - replies may now be out
+                # of step with commands, so start over next time.
+                self._shutdown()
+                self._failed_at = time.monotonic()
+                return None
+            return replies
+
+    def close(self):
+        """Detach the control client."""
+        with self._lock:
+            self._shutdown()
+
+    def _ensure_running(self) -> bool:
+        if self._proc and self._proc.poll() is None:
+            return True
+        if time.monotonic() - self._failed_at < self.RETRY_SECONDS:
+            return False
+
+        try:
+            proc = subprocess.Popen(
+                ["tmux", "-C", "attach-session"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError:
+            self._failed_at = time.monotonic()
+            return False
+
+        self._proc = proc
+        self._replies = queue.Queue()
+        threading.Thread(
+            target=self._read_replies, args=(proc, self._replies), daemon=True
+        ).start()
+
+        # Handshake: we only need command replies, not %output notifications
+        # for every byte written to every pane (tmux 3.2+; harmless before).
+        try:
+            proc.stdin.write("refresh-client -f no-output\n")
+            proc.stdin.flush()
+            reply = self._replies.get(timeout=self.timeout)
+        except (OSError, queue.Empty):
+            reply = None
+        if reply is None:
+            self._shutdown()
+            self._failed_at = time.monotonic()
+            return False
+        return True
+
+    @staticmethod
+    def _read_replies(proc: subprocess.Popen, replies: queue.Queue):
+        """Collect %begin/%end blocks for our commands, dropping notifications."""
+        block = None
+        number = flags = ""
+        for line in proc.stdout:
+            if block is None:
+                if line.startswith("%begin "):
+                    _, _, number, flags = line.split()
+                    block = []
+                continue
+
+            fields = line.split()
+            if (
+                len(fields) == 4
+                and fields[0] in ("%end", "%error")
+                and fields[2] == number
+            ):
+                # Flag 1 marks commands sent by this client; the implicit
+                # attach-session reply on startup has flag 0.
+                if flags == "1":
+                    replies.put((fields[0] == "%end", "".join(block)))
+                block = None
+            else:
+                block.append(line)
+        replies.put(None)  # EOF - the client exited
+
+    def _shutdown(self):
+        if self._proc:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self._proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+            self._proc = None
+
+
+_tmux = _TmuxControl()
+atexit.register(_tmux.close)
+
 
 def capture_tmux_pane(pane_id: str, lines: int = 50) -> str:
     """Capture the last N lines from a tmux pane."""
+    args = ("capture-pane", "-p", "-S", f"-{lines}", "-t", pane_id)
+    reply = _tmux.command(*args)
+    if reply is not None:
+        succeeded, output = reply
+        return strip_ansi(output) if succeeded else ""
+
     try:
         result = subprocess.run(
-            ["tmux", "capture-pane", "-p", "-S", f"-{lines}", "-t", pane_id],
+            ["tmux", *args],
             capture_output=True,
             text=True,
             timeout=5,
@@ -87,113 +369,535 @@ def capture_tmux_pane(pane_id: str, lines: int = 50) -> str:
         return ""
 
 
+# Printed after each capture in a batched command list to split the output
+_CAPTURE_END = "__tower_capture_end__"
+
+
+def _capture_panes_subprocess(pane_ids: list[str], lines: int) -> dict[str, str]:
+    """capture_tmux_panes without the control client: one `tmux` for all panes."""
+    if not pane_ids:
+        return {}
+    args = []
+    for pane in pane_ids:
+        args += ["capture-pane", "-p", "-S", f"-{lines}", "-t", pane, ";",
+                 "display-message", "-p", _CAPTURE_END, ";"]
+    try:
+        result = subprocess.run(
+            ["tmux", *args[:-1]],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except subprocess.TimeoutExpired:
+        return dict.fromkeys(pane_ids, "")
+
+    # tmux stops the list at the first pane it can't capture, so everything
+    # after the last complete capture belongs to that pane and the rest
+    # still need capturing.
+    done = result.stdout.split(f"{_CAPTURE_END}\n")[:-1]
+    outputs = {pane: strip_ansi(output) for pane, output in zip(pane_ids, done)}
+    if len(done) < len(pane_ids):
+        outputs[pane_ids[len(done)]] = ""
+        outputs.update(_capture_panes_subprocess(pane_ids[len(done) + 1:], lines))
+    return outputs
+
+
+def tail_lines(output: str, lines: int) -> str:
+    """The last `lines` lines of captured pane text."""
+    return "\n".join(output.rstrip("\n").split("\n")[-lines:])
+
+
+def last_nonblank_lines(output: str, count: int) -> list[str]:
+    """The last `count` non-blank lines of output, stripped, scanning from the end."""
+    lines = []
+    for line in reversed(output.splitlines()):
+        line = line.strip()
+        if line:
+            lines.append(line)
+            if len(lines) == count:
+                break
+    lines.reverse()
+    return lines
+
+
+def capture_tmux_panes(pane_ids: list[str], lines: int = 50) -> dict[str, str]:
+    """
+    Capture the last N lines from several panes, keyed by pane ID.
+
+    Through the control client this is one round trip to tmux for all of
+    them; without it, one tmux process runs every capture as a command list.
+    """
+    reply = _tmux.commands(
+        *(("capture-pane", "-p", "-S", f"-{lines}", "-t", pane) for pane in pane_ids)
+    )
+    if reply is None:
+        return _capture_panes_subprocess(pane_ids, lines)
+    return {
+        pane: strip_ansi(output) if succeeded else ""
+        for pane, (succeeded, output) in zip(pane_ids, reply)
+    }
+
+
+def run_tmux(*args: str) -> bool:
+    """Run a tmux command for its side effect. Returns True on success."""
+    reply = _tmux.command(*args)
+    if reply is not None:
+        return reply[0]
+    try:
+        result = subprocess.run(["tmux", *args], capture_output=True, timeout=5)
+        return result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def tmux_display(pane_id: str, fmt: str) -> Optional[str]:
+    """Expand a tmux format for a pane (display-message -p), or None on failure."""
+    reply = _tmux.command("display-message", "-p", "-t", pane_id, fmt)
+    if reply is not None:
+        return reply[1].rstrip("\n") if reply[0] else None
+    try:
+        result = subprocess.run(
+            ["tmux", "display-message", "-p", "-t", pane_id, fmt],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.rstrip("\n") if result.returncode == 0 else None
+
+
+def send_keys(pane_id: str, text: str) -> bool:
+    """Type text into a pane and press Enter. Returns True on success."""
+    if "\n" not in text:
+        return run_tmux("send-keys", "-t", pane_id, text, "Enter")
+
+    # Multi-line: load the whole text into a tmux buffer over stdin and
+    # bracket-paste it, all in one tmux invocation. Typing it with send-keys
+    # would submit at every newline.
+    buffer = f"tower-{pane_id}"
+    try:
+        result = subprocess.run(
+            [
+                "tmux", "load-buffer", "-b", buffer, "-",
+                ";", "paste-buffer", "-d", "-p", "-b", buffer, "-t", pane_id,
+                ";", "send-keys", "-t", pane_id, "Enter",
+            ],
+            input=text.encode(),
+            capture_output=True,
+            timeout=5,
+        )
+        return result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape codes from text."""
-    ansi_pattern = re.compile(r"\x1b\[[0-9;]*m")
-    return ansi_pattern.sub("", text)
+    if "\x1b" not in text:
+        return text
+    return _ANSI_RE.sub("", text)
+
+
+def _line_containing(text: str, pos: int) -> tuple[int, int]:
+    """Return the (start, end) bounds of the line in text containing pos."""
+    start = text.rfind("\n", 0, pos) + 1
+    end = text.find("\n", pos)
+    if end == -1:
+        end = len(text)
+    return start, end
 
 
 def detect_event(output: str) -> DetectedEvent:
     """Analyze tmux output and classify the current state."""
-    lines = output.strip().split("\n")
+    if not output or output.isspace():
+        return _EMPTY_NORMAL
+
     key_lines = []
 
-    # Check for errors
-    for pattern in ERROR_PATTERNS:
-        for line in lines:
-            if re.search(pattern, line, re.IGNORECASE):
-                key_lines.append(line.strip())
-                if len(key_lines) >= 5:
-                    break
-        if key_lines:
+    # Check for errors - scan the whole buffer in the regex engine and only
+    # recover the surrounding line for each hit, one hit per line. The cheap
+    # keyword gate skips the regex entirely on the common clean pane.
+    output_lower = output.lower()
+    if any(k in output_lower for k in _ERROR_KEYWORDS):
+        pos = 0
+        while len(key_lines) < 5:
+            match = _ERROR_RE.search(output, pos)
+            if not match:
+                break
+            start, end = _line_containing(output, match.start())
+            key_lines.append(output[start:end].strip())
+            pos = end + 1
+    if key_lines:
+        return DetectedEvent(
+            event_type=EventType.ERROR,
+            raw_output=output,
+            key_lines=tuple(key_lines),
+            confidence=0.9,
+            timestamp=time.time(),
+        )
+
+    # Check for permission prompts
+    lines = output.strip().split("\n")
+    for line in lines[-10:]:  # Permission prompts are usually recent
+        if _PERMISSION_RE.search(line):
             return DetectedEvent(
-                event_type=EventType.ERROR,
+                event_type=EventType.PERMISSION,
                 raw_output=output,
-                key_lines=key_lines[:5],
-                confidence=0.9,
+                key_lines=(line.strip(),),
+                confidence=0.95,
                 timestamp=time.time(),
             )
 
-    # Check for permission prompts
-    for pattern in PERMISSION_PATTERNS:
-        for line in lines[-10:]:  # Permission prompts are usually recent
-            if re.search(pattern, line, re.IGNORECASE):
-                key_lines.append(line.strip())
-                return DetectedEvent(
-                    event_type=EventType.PERMISSION,
-                    raw_output=output,
-                    key_lines=key_lines[:3],
-                    confidence=0.95,
-                    timestamp=time.time(),
-                )
-
     # Normal state
     return DetectedEvent(
         event_type=EventType.NORMAL,
         raw_output=output,
-        key_lines=[],
+        key_lines=(),
         confidence=1.0,
         timestamp=time.time(),
     )
 
 
+class _OutputNudge:
+    """
+    Wakes a monitor when its pane writes output.
+
+    tmux has no per-output hook, but `pipe-pane` streams everything a pane
+    writes into a shell command. Piping that into a FIFO we select() on lets
+    the monitor sleep until the pane actually changes, instead of
+    re-capturing an idle pane every poll interval.
+
+    A pane has only one pipe, and pipe-pane replaces whatever is there, so
+    a pane that is already piped (the user's own logging, or another Tower
+    watching it) is left alone and the monitor polls instead.
+    """
+
+    def __init__(self, pane_id: str):
+        self.pane_id = pane_id
+        if tmux_display(pane_id, "#{pane_pipe}") != "0":
+            raise OSError(f"tmux pane {pane_id} is already piped (or gone)")
+        self._dir = tempfile.mkdtemp(prefix="tower-")
+        self.path = os.path.join(self._dir, "nudge")
+        os.mkfifo(self.path, 0o600)
+        self._fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        # Hold a write end open ourselves so select() never spins on EOF
+        # while tmux's writer is starting up or after it exits.
+        self._keepalive_fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+
+        if not run_tmux("pipe-pane", "-t", pane_id, f"cat > {shlex.quote(self.path)}"):
+            self._cleanup()
+            raise OSError(f"tmux pipe-pane failed for {pane_id}")
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to timeout for pane output. Returns True if any arrived."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        # Drain - we only care that something was written, not what
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def writer_alive(self) -> bool:
+        """
+        Whether the pane's `cat` still has the FIFO open.
+
+        It exits when its pipe is replaced or closed (or the tmux server
+        goes away), and from then on wait() would never fire again. The
+        keepalive write end hides that EOF, so drop it for a moment and
+        look: a FIFO with no writers reads as EOF.
+        """
+        os.close(self._keepalive_fd)
+        try:
+            alive = os.read(self._fd, 65536) != b""  # Data means it's alive
+        except BlockingIOError:
+            alive = True  # A writer, with nothing pending
+        finally:
+            self._keepalive_fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+        return alive
+
+    def close(self):
+        """Stop piping the pane, if the pipe is still ours, and remove the FIFO."""
+        if self.writer_alive():
+            run_tmux("pipe-pane", "-t", self.pane_id)  # No command closes the pipe
+        self._cleanup()
+
+    def _cleanup(self):
+        for fd in (self._fd, self._keepalive_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+class PaneCache:
+    """
+    The latest captured output of each pane, written by the TmuxMonitors
+    that capture it and readable by anyone else who wants a pane's text.
+
+    Monitors store their snapshot on every check, recaptured or confirmed
+    unchanged, so while a monitor keeps up readers get current text without
+    running tmux themselves. Every snapshot expires, though - after MAX_AGE
+    for monitor-fed ones - so a monitor that checks rarely (the cold tier)
+    or has stopped seeing output costs a reader a live capture rather than
+    a wrong answer. Captures taken outside a monitor are kept for their own
+    `ttl`.
+    """
+
+    MAX_AGE = 3.0  # Seconds a monitor-fed snapshot counts as current
+
+    def __init__(self):
+        # pane -> (output, monotonic expiry)
+        self.snapshots: dict[str, tuple[str, float]] = {}
+        self.lock = threading.Lock()
+        # pane -> the monitor feeding it, woken when a reader finds its
+        # snapshot stale or the pane is about to change
+        self.monitors: dict[str, "TmuxMonitor"] = {}
+
+    def put(self, pane_id: str, output: str, ttl: Optional[float] = None):
+        """Store a pane's output as current for `ttl` seconds (MAX_AGE by default)."""
+        expires = time.monotonic() + (self.MAX_AGE if ttl is None else ttl)
+        with self.lock:
+            self.snapshots[pane_id] = (output, expires)
+
+    def get(self, pane_id: str, lines: int = 50) -> Optional[str]:
+        """The last `lines` lines of the pane's snapshot, or None if it has none."""
+        with self.lock:
+            entry = self.snapshots.get(pane_id)
+        if entry is None:
+            return None
+        output, expires = entry
+        if time.monotonic() >= expires:
+            return None
+        return tail_lines(output, lines)
+
+    def invalidate(self, pane_id: str):
+        """Forget a pane's snapshot, e.g. after sending it keys."""
+        with self.lock:
+            self.snapshots.pop(pane_id, None)
+        self._wake(pane_id)
+
+    def _wake(self, pane_id: str):
+        monitor = self.monitors.get(pane_id)
+        if monitor is not None:
+            monitor.wake()
+
+    def capture(self, pane_ids, lines: int, ttl: float = 1.5, depth: int = 50) -> dict[str, str]:
+        """
+        The last `lines` lines of each pane, keyed by pane ID.
+
+        Panes without a current snapshot are captured together in one go,
+        `depth` lines deep so later readers wanting more lines can share
+        them, and kept for `ttl` seconds.
+        """
+        snapshots = {}
+        missing = []
+        for pane in pane_ids:
+            output = self.get(pane, lines)
+            if output is None:
+                missing.append(pane)
+            else:
+                snapshots[pane] = output
+        if missing:
+            for pane, output in capture_tmux_panes(missing, lines=depth).items():
+                self.put(pane, output, ttl=ttl)
+                snapshots[pane] = tail_lines(output, lines)
+                self._wake(pane)  # Someone's looking: have its monitor watch closely
+        return snapshots
+
+
 class TmuxMonitor:
     """Monitors a tmux pane for events that need escalation."""
 
-    def __init__(self, pane_id: str, poll_interval: float = 2.0):
+    # Polling-mode intervals with `tiered` set: "hot" while the pane is
+    # producing output or waiting on a prompt, "warm" once it goes quiet,
+    # "cold" once it goes quiet on an error or a finished run
+    TIER_INTERVALS = {"hot": 0.5, "warm": 2.5, "cold": 30.0}
+    HOT_TICKS = 10  # Checks a pane stays hot after output or an event
+
+    def __init__(
+        self,
+        pane_id: str,
+        poll_interval: float = 2.0,
+        pane_cache: Optional[PaneCache] = None,
+        tiered: bool = False,
+    ):
         self.pane_id = pane_id
         self.poll_interval = poll_interval
+        self.tiered = tiered
+        self.tier = "warm"
+        self._resting_tier = "warm"  # Where a hot pane settles once it goes quiet
+        self._hot_ticks = 0
+        self.pane_cache = pane_cache  # Refreshed on every check, if given
+        if pane_cache is not None:
+            pane_cache.monitors[pane_id] = self
+        self._woken = threading.Event()  # Cuts a polling-mode sleep short
         self.last_output = ""
         self.last_event_time = 0
         self.last_change_time = time.time()
         self.debounce_seconds = 300  # 5 minutes
         self.stuck_threshold = 600  # 10 minutes without change = stuck
+        self.settle_seconds = 0.5  # Coalesce an output burst into one capture
+        self._nudge: Optional[_OutputNudge] = None
+        self._output_pending = True
+        self._captured_second: Optional[int] = None  # When last_output was captured
+        self.resync_seconds = 60  # Output-driven mode still recaptures this often
 
     def check_once(self) -> Optional[DetectedEvent]:
         """Check for new events. Returns event if one is detected."""
-        output = capture_tmux_pane(self.pane_id)
+        if (
+            self._nudge is not None
+            and not self._output_pending
+            and time.time() - self._captured_second < self.resync_seconds
+        ):
+            # The pane hasn't written anything since the last capture
+            output = self.last_output
+        elif self._nudge is None and not self._output_since_capture():
+            output = self.last_output
+        else:
+            self._captured_second = int(time.time())
+            output = capture_tmux_pane(self.pane_id)
+        if self.pane_cache is not None:
+            # Stored even when unchanged: this check is what makes it current
+            self.pane_cache.put(self.pane_id, output)
+        now = time.time()  # One clock reading for all the debounce/stuck math
 
         # Track output changes for STUCK detection
         if output != self.last_output:
-            self.last_change_time = time.time()
+            self.last_change_time = now
             self.last_output = output
         else:
             # Check for STUCK state: no output change for threshold
-            idle_time = time.time() - self.last_change_time
+            idle_time = now - self.last_change_time
             if idle_time > self.stuck_threshold:
                 # Only trigger STUCK once per threshold period
-                if time.time() - self.last_event_time > self.debounce_seconds:
-                    self.last_event_time = time.time()
+                if now - self.last_event_time > self.debounce_seconds:
+                    self.last_event_time = now
                     return DetectedEvent(
                         event_type=EventType.STUCK,
                         raw_output=output,
-                        key_lines=[f"No activity for {int(idle_time / 60)} minutes"],
+                        key_lines=(f"No activity for {int(idle_time / 60)} minutes",),
                         confidence=0.8,
-                        timestamp=time.time(),
+                        timestamp=now,
                     )
+            self._cool_down()
             return None
 
         event = detect_event(output)
+        self._resting_tier = self._tier_for(event)
+        self.boost()
 
         # Skip normal events
         if event.event_type == EventType.NORMAL:
             return None
 
         # Debounce: don't re-trigger too quickly
-        if time.time() - self.last_event_time < self.debounce_seconds:
+        if now - self.last_event_time < self.debounce_seconds:
             return None
 
-        self.last_event_time = time.time()
+        self.last_event_time = now
         return event
 
+    def boost(self, ticks: Optional[int] = None):
+        """Poll at the hot interval for the next `ticks` checks."""
+        self.tier = "hot"
+        self._hot_ticks = self.HOT_TICKS if ticks is None else ticks
+
+    def wake(self):
+        """From another thread: check the pane now, then poll it hot for a while."""
+        self.boost()
+        self._woken.set()
+
+    def _cool_down(self):
+        """An unchanged check: let a hot pane settle into its resting tier."""
+        if self.tier != "hot":
+            return
+        self._hot_ticks -= 1
+        if self._hot_ticks <= 0:
+            self.tier = self._resting_tier
+
+    @staticmethod
+    def _tier_for(event: DetectedEvent) -> str:
+        """The tier a pane showing this event's output rests at once it goes quiet."""
+        if event.event_type == EventType.PERMISSION:
+            return "hot"  # Waiting on a reply
+        if event.event_type == EventType.ERROR:
+            return "cold"
+        if any(_DONE_RE.search(line) for line in last_nonblank_lines(event.raw_output, 3)):
+            return "cold"
+        return "warm"
+
+    def _output_since_capture(self) -> bool:
+        """
+        Polling mode: ask tmux whether the pane's window has written output
+        since the last capture - a one-line reply instead of a full capture.
+
+        #{history_size} alone would miss output that doesn't scroll (a
+        prompt redrawn in place), so this uses #{window_activity}, which
+        tmux updates on any output. True whenever it can't tell.
+        """
+        if self._captured_second is None:
+            return True
+        reply = _tmux.command("display-message", "-p", "-t", self.pane_id, "#{window_activity}")
+        if reply is None or not reply[0]:
+            return True  # Without control mode a probe costs as much as a capture
+        try:
+            activity = int(reply[1])
+        except ValueError:
+            return True
+        # One-second resolution: output in the same second as the capture
+        # may have come after it
+        return activity >= self._captured_second
+
     def run(self, callback):
         """Run the monitor loop, calling callback on each detected event."""
-        print(f"[Tower] Monitoring tmux pane {self.pane_id}...")
-        while True:
-            event = self.check_once()
-            if event:
-                callback(event)
-            time.sleep(self.poll_interval)
+        try:
+            self._nudge = _OutputNudge(self.pane_id)
+            mode = "output-driven"
+        except OSError:
+            self._nudge = None  # No FIFO support or pipe-pane failed - poll
+            mode = "polling"
+        log.info("Monitoring tmux pane %s (%s)...", self.pane_id, mode)
+
+        try:
+            while True:
+                event = self.check_once()
+                if event:
+                    callback(event)
+                    if event.event_type in (EventType.PERMISSION, EventType.ERROR):
+                        self.boost()  # Watch closely for the response
+                self._wait_for_output()
+        finally:
+            if self._nudge:
+                self._nudge.close()
+                self._nudge = None
+
+    def _wait_for_output(self):
+        """Sleep until the pane changes, waking at least every poll interval."""
+        if self._nudge is None:
+            self._woken.wait(self.TIER_INTERVALS[self.tier] if self.tiered else self.poll_interval)
+            self._woken.clear()
+            return
+
+        # Waking every poll interval regardless keeps STUCK timing advancing
+        self._output_pending = self._nudge.wait(self.poll_interval)
+        if self._output_pending:
+            time.sleep(self.settle_seconds)
+            self._nudge.wait(0)
+        elif not self._nudge.writer_alive():
+            # Our pipe was replaced or closed: re-pipe the pane if it's free,
+            # else poll, and recapture either way
+            self._nudge.close()
+            try:
+                self._nudge = _OutputNudge(self.pane_id)
+            except OSError:
+                self._nudge = None
+            log.info("Lost the output pipe on %s, %s", self.pane_id,
+                     "re-piped it" if self._nudge else "polling instead")
+            self._output_pending = True
 
 
 class HooksListener:
@@ -208,6 +912,8 @@ class HooksListener:
         await listener.start()  # Runs until cancelled
     """
 
+    KEEPALIVE_SECONDS = 60.0  # Idle time before a framed connection is closed
+
     def __init__(
         self,
         callback: Callable[[DetectedEvent], None],
@@ -227,14 +933,14 @@ class HooksListener:
 
         # Create Unix socket server
         self.server = await asyncio.start_unix_server(
-            self._handle_connection, self.socket_path
+            self._handle_connection, self.socket_path, backlog=HOOKS_BACKLOG
         )
 
         # Make socket world-writable so hooks can connect
         os.chmod(self.socket_path, 0o666)
 
         self._running = True
-        print(f"[Tower] Hooks listener started on {self.socket_path}")
+        log.info("Hooks listener started on %s", self.socket_path)
 
         async with self.server:
             await self.server.serve_forever()
@@ -254,43 +960,77 @@ class HooksListener:
     async def _handle_connection(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ):
-        """Handle incoming hook event."""
+        """
+        Handle a hook connection.
+
+        Accepts either a single raw JSON payload (what tower-hook.sh sends
+        through nc), or any number of length-prefixed frames - `<length>\\n`
+        followed by that many bytes of JSON - over one kept-alive connection,
+        so a busy client doesn't pay a connect/teardown per event.
+        """
         try:
-            data = await asyncio.wait_for(reader.read(8192), timeout=5.0)
-            if not data:
+            header = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            if not header.strip():
                 return
 
-            # Parse the hook event
-            try:
-                hook_data = json.loads(data.decode("utf-8"))
-            except json.JSONDecodeError:
-                print(f"[Tower] Invalid JSON from hook: {data[:100]}")
+            if header.lstrip().startswith(b"{"):
+                # Single-shot payload, normally one line from `jq -c`
+                data = header
+                if not data.rstrip().endswith(b"}"):
+                    data += await asyncio.wait_for(reader.read(8192), timeout=5.0)
+                await self._handle_payload(data)
                 return
 
-            # Convert to DetectedEvent
-            event = self._parse_hook_event(hook_data)
-            if event:
-                # Call the callback (run in executor if it's sync)
-                if asyncio.iscoroutinefunction(self.callback):
-                    await self.callback(event)
-                else:
-                    self.callback(event)
+            while header:
+                try:
+                    length = int(header)
+                except ValueError:
+                    log.warning("Invalid frame header from hook: %r", header[:100])
+                    return
+                data = await asyncio.wait_for(reader.readexactly(length), timeout=5.0)
+                await self._handle_payload(data)
+                header = await asyncio.wait_for(
+                    reader.readline(), timeout=self.KEEPALIVE_SECONDS
+                )
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
             pass
-        except Exception as e:
-            print(f"[Tower] Hook handler error: {e}")
+        except Exception:
+            log.exception("Hook handler error")
         finally:
             writer.close()
             await writer.wait_closed()
 
+    async def _handle_payload(self, data: bytes):
+        """Parse one hook JSON payload and dispatch it to the callback."""
+        try:
+            if orjson is not None:
+                hook_data = orjson.loads(data)  # Accepts bytes directly
+            else:
+                hook_data = json.loads(data.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            log.warning("Invalid JSON from hook: %r", data[:100])
+            return
+
+        # Convert to DetectedEvent
+        event = self._parse_hook_event(hook_data)
+        if event:
+            # Call the callback (run in executor if it's sync)
+            if asyncio.iscoroutinefunction(self.callback):
+                await self.callback(event)
+            else:
+                self.callback(event)
+
     def _parse_hook_event(self, hook_data: dict) -> Optional[DetectedEvent]:
         """Convert hook JSON data to DetectedEvent."""
         event_name = hook_data.get("hook_event_name", "")
 
         # Extract key information based on event type
         key_lines = []
-        raw_output = json.dumps(hook_data, indent=2)
+        if orjson is not None:
+            raw_output = orjson.dumps(hook_data, option=orjson.OPT_INDENT_2).decode()
+        else:
+            raw_output = json.dumps(hook_data, indent=2)
 
         if event_name == "PermissionRequest":
             # Permission prompt detected
@@ -308,7 +1048,7 @@ class HooksListener:
             return DetectedEvent(
                 event_type=EventType.PERMISSION,
                 raw_output=raw_output,
-                key_lines=key_lines,
+                key_lines=tuple(key_lines),
                 confidence=1.0,  # High confidence - direct from Claude Code
                 timestamp=time.time(),
             )
@@ -321,7 +1061,7 @@ class HooksListener:
                 return DetectedEvent(
                     event_type=EventType.PERMISSION,
                     raw_output=raw_output,
-                    key_lines=key_lines,
+                    key_lines=tuple(key_lines),
                     confidence=1.0,
                     timestamp=time.time(),
                 )
@@ -333,9 +1073,10 @@ class HooksListener:
 if __name__ == "__main__":
     # Quick test - can run with --hooks to test hooks listener
     import sys
-    from dotenv import load_dotenv
+    from env import load_env
 
-    load_dotenv()
+    load_env()
+    configure_logging()
 
     def on_event(event: DetectedEvent):
         print(f"\n{'='*50}")
@@ -356,6 +1097,7 @@ if __name__ == "__main__":
             listener = HooksListener(callback=on_event)
             await listener.start()
 
+        install_uvloop()
         asyncio.run(run_hooks())
     else:
         # Test tmux monitor
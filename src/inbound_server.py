@@ -7,79 +7,113 @@ and issue commands by voice. Like calling the tower for a sitrep on your fleet.
 
 import os
 import json
+import re
 import subprocess
+from collections import namedtuple
 from datetime import datetime
 from flask import Flask, request, Response
 from twilio.twiml.voice_response import VoiceResponse, Gather
 import pyotp
 
-from event_detector import capture_tmux_pane, strip_ansi
-from summarizer import Summarizer
+from env import load_env
+from event_detector import capture_tmux_panes, strip_ansi
+from ttl_cache import TTLCache
 
 app = Flask(__name__)
 
-# In-memory session state (use Redis in production)
-call_sessions = {}
+# In-memory session state (use Redis in production). Bounded so every
+# CallSid, including failed auth attempts, doesn't accumulate forever.
+call_sessions = TTLCache(maxsize=1024, ttl=3600)
+
+load_env()
 
 # TOTP secret - generate once with: pyotp.random_base32()
 # Store in .env, share with your authenticator app
 TOTP_SECRET = os.getenv("TOTP_SECRET", pyotp.random_base32())
+_TOTP = pyotp.TOTP(TOTP_SECRET)
+
+# Registered tmux sessions to monitor, decoded and checked once at import
+# (a missing or unexpected key fails here rather than mid-call)
+_Session = namedtuple("_Session", "name pane")
+TMUX_SESSIONS = tuple(
+    _Session(**s)
+    for s in json.loads(os.getenv("TMUX_SESSIONS", '[{"name": "main", "pane": "%0"}]'))
+)
+
+# One entry per session in a status sweep
+_SessionStatus = namedtuple("_SessionStatus", "name pane status detail raw_output")
 
-# Registered tmux sessions to monitor
-TMUX_SESSIONS = json.loads(os.getenv("TMUX_SESSIONS", '[{"name": "main", "pane": "%0"}]'))
+# Quick status keywords, matched case-insensitively in a single pass over the
+# pane instead of one substring scan per keyword.
+_STATUS_RE = re.compile(
+    r"(?P<error>error|failed|exception)"
+    r"|(?P<waiting>waiting|approve|confirm|y/n)"
+    r"|(?P<done>complete|done|finished|pushed)",
+    re.IGNORECASE,
+)
+
+# Session number in a spoken command ("session 3", or just "3")
+_SESSION_NUM_RE = re.compile(r"\bsession\s+(\d+)\b|\b(\d+)\b")
 
 
 def verify_totp(code: str) -> bool:
     """Verify a TOTP code."""
-    totp = pyotp.TOTP(TOTP_SECRET)
-    return totp.verify(code, valid_window=1)  # Allow 30s drift
+    return _TOTP.verify(code, valid_window=1)  # Allow 30s drift
 
 
-def get_all_session_statuses() -> list[dict]:
+def get_all_session_statuses() -> list[_SessionStatus]:
     """Get current status of all registered tmux sessions."""
     statuses = []
-    summarizer = Summarizer()
 
-    for session in TMUX_SESSIONS:
-        output = capture_tmux_pane(session["pane"], lines=30)
+    # Capture every pane in one go - a single round trip through the tmux
+    # control client, or one tmux process without it
+    outputs = capture_tmux_panes([s.pane for s in TMUX_SESSIONS], lines=30)
 
+    for session in TMUX_SESSIONS:
+        output = outputs[session.pane]
         if not output.strip():
             status = "idle or not running"
             detail = ""
         else:
             # Quick classification without full summarization
-            output_lower = output.lower()
-            if any(x in output_lower for x in ["error", "failed", "exception"]):
+            out_lines = output.split("\n")
+            found = set()
+            for match in _STATUS_RE.finditer(output):
+                found.add(match.lastgroup)
+                if match.lastgroup == "error":
+                    break  # Highest priority, nothing left to learn
+
+            if "error" in found:
                 status = "hit a problem"
                 # Get the error line
-                for line in output.split("\n"):
+                for line in out_lines:
                     if any(x in line.lower() for x in ["error", "failed"]):
                         detail = line.strip()[:100]
                         break
                 else:
                     detail = "check the logs"
-            elif any(x in output_lower for x in ["waiting", "approve", "confirm", "y/n"]):
+            elif "waiting" in found:
                 status = "waiting for your input"
-                detail = output.split("\n")[-3] if output.split("\n") else ""
-            elif any(x in output_lower for x in ["complete", "done", "finished", "pushed"]):
+                detail = out_lines[-3] if len(out_lines) >= 3 else out_lines[-1]
+            elif "done" in found:
                 status = "finished its task"
                 detail = ""
             else:
                 status = "working"
                 detail = ""
 
-        statuses.append({
-            "name": session["name"],
-            "pane": session["pane"],
-            "status": status,
-            "detail": detail,
-            "raw_output": output[-500:],
-        })
+        statuses.append(_SessionStatus(
+            name=session.name,
+            pane=session.pane,
+            status=status,
+            detail=detail,
+            raw_output=output[-500:],
+        ))
 
     return statuses
 
 
-def generate_status_speech(statuses: list[dict]) -> str:
+def generate_status_speech(statuses: list[_SessionStatus]) -> str:
     """Generate a casual spoken status update."""
     if not statuses:
         return "Looks like nothing's running right now. Pretty quiet."
@@ -88,11 +122,11 @@ def generate_status_speech(statuses: list[dict]) -> str:
     needs_attention = []
 
     for i, s in enumerate(statuses, 1):
-        name = s["name"]
-        status = s["status"]
+        name = s.name
+        status = s.status
 
         if status == "hit a problem":
-            lines.append(f"Session {i}, {name}, hit a snag. {s['detail'][:50] if s['detail'] else 'Check the logs.'}")
+            lines.append(f"Session {i}, {name}, hit a snag. {s.detail[:50] if s.detail else 'Check the logs.'}")
             needs_attention.append(i)
         elif status == "waiting for your input":
             lines.append(f"Session {i}, {name}, is waiting on you.")
@@ -134,16 +168,16 @@ def answer_call():
     # Casual greeting
     import random
     greeting = random.choice(GREETINGS)
-    response.say(greeting, voice="Polly.Matthew")  # Natural male voice
 
-    # Ask for TOTP
+    # Greeting and TOTP prompt as one <Say>, so Twilio synthesizes a single
+    # utterance instead of two segments with a gap between them.
     gather = Gather(
         num_digits=6,
         action="/voice/verify",
         method="POST",
         timeout=10,
     )
-    gather.say("What's your code?", voice="Polly.Matthew")
+    gather.say(f"{greeting} What's your code?", voice="Polly.Matthew")  # Natural male voice
     response.append(gather)
 
     # If no input
@@ -168,9 +202,6 @@ def verify_code():
         session["authenticated"] = True
         call_sessions[call_sid] = session
 
-        response.say("Authenticated. You're clear.", voice="Polly.Matthew")
-        response.pause(length=1)
-
         # Get and speak status
         statuses = get_all_session_statuses()
         session["statuses"] = statuses
@@ -185,7 +216,10 @@ def verify_code():
             timeout=5,
             speech_timeout="auto",
         )
-        gather.say(f"Here's your sitrep. {status_speech}", voice="Polly.Matthew")
+        gather.say(
+            f"Authenticated. You're clear. Here's your sitrep. {status_speech}",
+            voice="Polly.Matthew",
+        )
         response.append(gather)
 
         response.say("Still there? I'll hang up if you're done.", voice="Polly.Matthew")
@@ -196,14 +230,13 @@ def verify_code():
             response.say("Too many tries. Talk later.", voice="Polly.Matthew")
             response.hangup()
         else:
-            response.say("That's not it. Try again.", voice="Polly.Matthew")
             gather = Gather(
                 num_digits=6,
                 action="/voice/verify",
                 method="POST",
                 timeout=10,
             )
-            gather.say("What's your code?", voice="Polly.Matthew")
+            gather.say("That's not it. Try again. What's your code?", voice="Polly.Matthew")
             response.append(gather)
 
     return Response(str(response), mimetype="text/xml")
@@ -228,6 +261,9 @@ def handle_command():
 
     statuses = session.get("statuses", [])
 
+    # The reply is spoken together with the follow-up prompt in one <Say>
+    reply = ""
+
     # Parse commands
     if digits:
         # DTMF: session number
@@ -235,13 +271,12 @@ def handle_command():
             session_num = int(digits)
             if 1 <= session_num <= len(statuses):
                 s = statuses[session_num - 1]
-                response.say(
-                    f"Session {session_num}, {s['name']}. Status: {s['status']}. "
-                    f"Last output was: {s['raw_output'][-200:] if s['raw_output'] else 'nothing recent'}",
-                    voice="Polly.Matthew"
+                reply = (
+                    f"Session {session_num}, {s.name}. Status: {s.status}. "
+                    f"Last output was: {s.raw_output[-200:] if s.raw_output else 'nothing recent'}"
                 )
         except ValueError:
-            response.say("Didn't get that.", voice="Polly.Matthew")
+            reply = "Didn't get that."
 
     elif speech:
         # Voice command parsing
@@ -253,51 +288,47 @@ def handle_command():
         elif any(x in speech for x in ["approve", "yes", "continue", "go ahead"]):
             # Find session needing approval and send "yes"
             for i, s in enumerate(statuses):
-                if s["status"] == "waiting for your input":
-                    pane = s["pane"]
+                if s.status == "waiting for your input":
+                    pane = s.pane
                     subprocess.run(
                         ["tmux", "send-keys", "-t", pane, "yes", "Enter"],
                         timeout=5,
                     )
-                    response.say(f"Done. Told session {i+1} to continue.", voice="Polly.Matthew")
+                    reply = f"Done. Told session {i+1} to continue."
                     break
             else:
-                response.say("Nothing's waiting for approval right now.", voice="Polly.Matthew")
+                reply = "Nothing's waiting for approval right now."
 
         elif any(x in speech for x in ["retry", "try again"]):
             for i, s in enumerate(statuses):
-                if s["status"] == "hit a problem":
-                    pane = s["pane"]
+                if s.status == "hit a problem":
+                    pane = s.pane
                     subprocess.run(
                         ["tmux", "send-keys", "-t", pane, "retry", "Enter"],
                         timeout=5,
                     )
-                    response.say(f"Told session {i+1} to retry.", voice="Polly.Matthew")
+                    reply = f"Told session {i+1} to retry."
                     break
 
         elif any(x in speech for x in ["stop", "abort", "kill"]):
-            response.say("Which session? Say the number.", voice="Polly.Matthew")
+            reply = "Which session? Say the number."
 
         elif any(x in speech for x in ["status", "update", "what's happening"]):
             statuses = get_all_session_statuses()
             session["statuses"] = statuses
             call_sessions[call_sid] = session
-            status_speech = generate_status_speech(statuses)
-            response.say(status_speech, voice="Polly.Matthew")
+            reply = generate_status_speech(statuses)
 
         else:
             # Try to extract a session number
-            for i in range(1, 10):
-                if str(i) in speech or f"session {i}" in speech:
-                    if i <= len(statuses):
-                        s = statuses[i - 1]
-                        response.say(
-                            f"Session {i}, {s['name']}. {s['status']}.",
-                            voice="Polly.Matthew"
-                        )
-                    break
+            match = _SESSION_NUM_RE.search(speech)
+            if match:
+                i = int(match.group(1) or match.group(2))
+                if 1 <= i <= len(statuses):
+                    s = statuses[i - 1]
+                    reply = f"Session {i}, {s.name}. {s.status}."
             else:
-                response.say("Didn't catch that. Say a session number or a command.", voice="Polly.Matthew")
+                reply = "Didn't catch that. Say a session number or a command."
 
     # Continue listening
     gather = Gather(
@@ -307,7 +338,7 @@ def handle_command():
         timeout=5,
         speech_timeout="auto",
     )
-    gather.say("What else?", voice="Polly.Matthew")
+    gather.say(f"{reply} What else?".lstrip(), voice="Polly.Matthew")
     response.append(gather)
 
     response.say("Alright, I'll let you go. Later.", voice="Polly.Matthew")
@@ -324,8 +355,7 @@ def status():
 
 def print_totp_setup():
     """Print TOTP setup info."""
-    totp = pyotp.TOTP(TOTP_SECRET)
-    uri = totp.provisioning_uri(name="tower", issuer_name="Tower")
+    uri = _TOTP.provisioning_uri(name="tower", issuer_name="Tower")
 
     print("\n" + "=" * 60)
     print("TOTP SETUP")
@@ -333,21 +363,18 @@ def print_totp_setup():
     print(f"\nSecret: {TOTP_SECRET}")
     print(f"\nAdd to your authenticator app, or use this URI:")
     print(f"{uri}")
-    print(f"\nCurrent code: {totp.now()}")
+    print(f"\nCurrent code: {_TOTP.now()}")
     print("=" * 60 + "\n")
 
 
 if __name__ == "__main__":
-    from dotenv import load_dotenv
-    load_dotenv()
-
     print_totp_setup()
 
     print("Tower is online.")
     print("Point Twilio webhook to: https://your-ngrok.io/voice/answer")
     print("\nRegistered sessions:")
     for s in TMUX_SESSIONS:
-        print(f"  - {s['name']}: pane {s['pane']}")
+        print(f"  - {s.name}: pane {s.pane}")
     print()
 
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -3,26 +3,36 @@ Main entry point for the Claude Code phone wrapper.
 Orchestrates event detection, summarization, calling, and response handling.
 """
 
+import atexit
+import json
 import os
-import subprocess
+import queue
+import sys
+import threading
 import time
 import uuid
-from dataclasses import dataclass, field
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from typing import Optional
 
-from dotenv import load_dotenv
+# Optional: faster JSON encoding of log entries
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from event_detector import DetectedEvent, EventType, TmuxMonitor
+from env import load_env
+from event_detector import DetectedEvent, EventType, TmuxMonitor, configure_logging, send_keys
 from summarizer import Summary, Summarizer
 from phone_caller import PhoneCaller, LocalTTSFallback
 
 
-@dataclass
+@dataclass(slots=True)
 class InteractionLog:
     """Log entry for each escalation interaction."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    timestamp_ns: int = field(default_factory=time.time_ns)  # Rendered to ISO when written
     session: str = ""
     pane: str = ""
     event_type: str = ""
@@ -34,6 +44,24 @@ class InteractionLog:
     outcome: str = ""
 
 
+_LOG_FIELDS = tuple(f.name for f in fields(InteractionLog))
+
+
+def _encode_log(log: InteractionLog) -> bytes:
+    """Serialize a log entry as one JSON line."""
+    entry = {}
+    for name in _LOG_FIELDS:
+        if name == "timestamp_ns":
+            entry["timestamp"] = datetime.fromtimestamp(
+                log.timestamp_ns / 1e9, tz=timezone.utc
+            ).isoformat()
+        else:
+            entry[name] = getattr(log, name)
+    if orjson is not None:
+        return orjson.dumps(entry) + b"\n"
+    return json.dumps(entry).encode() + b"\n"
+
+
 class ClaudeCodeWrapper:
     """Main wrapper that ties everything together."""
 
@@ -57,65 +85,149 @@ class ClaudeCodeWrapper:
 
         self.logs: list[InteractionLog] = []
 
+        # Interaction log (SQLite in production), opened once and appended to
+        # for the life of the wrapper
+        log_file = os.path.join(
+            os.path.dirname(__file__), "..", "logs", "interactions.jsonl"
+        )
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        self._log_f = open(log_file, "ab", buffering=64 * 1024)
+
+        # Entries are written by a background thread so a slow disk never
+        # delays an escalation. If the queue fills up, entries are dropped
+        # (and counted) rather than blocking handle_event.
+        self._log_q: queue.Queue = queue.Queue(maxsize=1024)
+        self._log_dropped = 0
+        self._log_thread = threading.Thread(target=self._log_drain, daemon=True)
+        self._log_thread.start()
+        atexit.register(self._close_log)
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+        # Calls waiting on a keypress: session id -> queue the webhook fills.
+        # The waits get their own threads so the monitor keeps polling (and
+        # the pool stays free for the next call) while a call is open.
+        self._pending: dict[str, queue.Queue] = {}
+        self._reply_pool = ThreadPoolExecutor(max_workers=4)
+        self.response_timeout = 120.0
+
+    def deliver_response(self, session_id: str, digit: str) -> bool:
+        """Hand a call's keypress to the event waiting on it. False if none is."""
+        replies = self._pending.get(session_id)
+        if replies is None:
+            return False
+        try:
+            replies.put_nowait(digit)
+        except queue.Full:
+            return False  # Already answered
+        return True
+
     def send_to_claude(self, instruction: str) -> bool:
         """Send an instruction back to the Claude Code pane."""
-        try:
-            # Send the instruction text
-            subprocess.run(
-                ["tmux", "send-keys", "-t", self.pane_id, instruction, "Enter"],
-                check=True,
-                timeout=5,
-            )
+        # Goes through the monitor's persistent tmux control client when it's
+        # up, so replying doesn't fork a tmux process per instruction.
+        if send_keys(self.pane_id, instruction):
             print(f"[Sent] {instruction}")
             return True
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            print(f"[Error] Failed to send to tmux: {e}")
-            return False
+        print(f"[Error] Failed to send to tmux pane {self.pane_id}")
+        return False
 
     def handle_event(self, event: DetectedEvent):
         """Process a detected event through the full pipeline."""
-        print(f"\n{'='*60}")
-        print(f"EVENT DETECTED: {event.event_type.value}")
-        print(f"Time: {datetime.now().isoformat()}")
-        print(f"{'='*60}")
+        # Banners are written in one go rather than a print() per line
+        sys.stdout.write(
+            f"\n{'='*60}\n"
+            f"EVENT DETECTED: {event.event_type.value}\n"
+            f"Time: {time.strftime('%Y-%m-%dT%H:%M:%S')}\n"
+            f"{'='*60}\n"
+            "\nGenerating summary...\n"
+        )
+        sys.stdout.flush()
 
         # Create log entry
         log = InteractionLog(
             pane=self.pane_id,
             event_type=event.event_type.value,
-            raw_output=event.raw_output[-1000:],
+            raw_output=event.raw_tail[-1000:],
         )
 
-        # Generate summary
-        print("\nGenerating summary...")
-        summary = self.summarizer.summarize(event)
+        if not self.use_phone and event.event_type in (EventType.STUCK, EventType.PERMISSION):
+            # Urgent: speak the canned summary at once, then the model's
+            # version if it turns out to say something else
+            basic, upgrade = self.summarizer.summarize_fast(event)
+            print(f"\nSummary: {basic.speech_text}")
+            speaking = self.caller.say(basic.speech_text)
+            summary = upgrade.result()
+            if summary.speech_text != basic.speech_text:
+                print(f"Update: {summary.speech_text}")
+                # Queued behind the first, so it plays once that finishes
+                speaking = self.caller.say(summary.speech_text)
+        else:
+            # Generate summary. The speech streams in ahead of the options; in
+            # local mode start speaking it while the rest is still generating.
+            partials = self.summarizer.summarize_streaming(event)
+            first = next(partials)
+            print(f"\nSummary: {first.speech_text}")
+            if not self.use_phone:
+                speaking = self.caller.say(first.speech_text)
+            summary = first.summary
+            for partial in partials:
+                summary = partial.summary
+
+        # Place the call as soon as the summary is complete (its TwiML is
+        # sent inline with the options, so not before) and fill in the log
+        # entry while the Twilio request is in flight.
+        if self.use_phone:
+            print(f"\nCalling {self.phone_number}...")
+            session_id = log.id
+            # Register before dialing so an immediate keypress isn't lost
+            replies = self._pending[session_id] = queue.Queue(maxsize=1)
+            call = self._pool.submit(
+                self.caller.make_call, self.phone_number, summary, session_id
+            )
+
         log.speech_text = summary.speech_text
         log.options_offered = [
             {"key": o.key, "label": o.label} for o in summary.options
         ]
 
-        print(f"\nSummary: {summary.speech_text}")
-
         # Get human response
         if self.use_phone:
-            print(f"\nCalling {self.phone_number}...")
-            session_id = log.id
-            result = self.caller.make_call(self.phone_number, summary, session_id)
-            print(f"Call initiated: {result.call_sid}")
-            # Note: In real implementation, we'd wait for webhook callback
-            # For now, fall back to local input
-            response = input("Enter response digit (simulating phone): ").strip()
+            self._reply_pool.submit(self._await_reply, log, summary, call, session_id, replies)
         else:
-            response = self.caller.speak_and_prompt(summary)
+            speaking.result()
+            self._finish(log, summary, self.caller.prompt(summary))
 
+    def _await_reply(
+        self,
+        log: InteractionLog,
+        summary: Summary,
+        call: Future,
+        session_id: str,
+        replies: queue.Queue,
+    ):
+        """Reply thread: wait for the call's keypress, then act on it."""
+        try:
+            result = call.result()
+            print(f"Call initiated: {result.call_sid}")
+            # The digit arrives through the /webhook/response callback
+            response = replies.get(timeout=self.response_timeout)
+        except queue.Empty:
+            print("No response from the call.")
+            response = None
+        except Exception as e:
+            print(f"[Error] Call to {self.phone_number} failed: {e}")
+            response = None
+        finally:
+            self._pending.pop(session_id, None)
+        self._finish(log, summary, response)
+
+    def _finish(self, log: InteractionLog, summary: Summary, response: Optional[str]):
+        """Send the instruction for the human's response and record the interaction."""
         log.human_response = response or ""
 
         # Map response to instruction
-        instruction = None
-        for opt in summary.options:
-            if opt.key == response:
-                instruction = opt.instruction
-                break
+        opt = summary.by_key.get(response)
+        instruction = opt.instruction if opt else None
 
         if instruction:
             log.instruction_sent = instruction
@@ -131,37 +243,93 @@ class ClaudeCodeWrapper:
         print(f"\n{'='*60}\n")
 
     def _save_log(self, log: InteractionLog):
-        """Save log entry to file (SQLite in production)."""
-        import json
-
-        log_file = os.path.join(
-            os.path.dirname(__file__), "..", "logs", "interactions.jsonl"
-        )
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        """Queue a log entry for the writer thread."""
+        try:
+            self._log_q.put_nowait(log)
+        except queue.Full:
+            self._log_dropped += 1
+
+    def _log_drain(self):
+        """Writer thread: append queued entries in batches of up to 32."""
+        while True:
+            batch = [self._log_q.get()]
+            # Give a burst 50 ms to coalesce into the same write
+            deadline = time.monotonic() + 0.05
+            while len(batch) < 32 and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            self._log_f.writelines(_encode_log(log) for log in batch)
+            self._log_f.flush()
+            if stop:
+                return
+
+    def _close_log(self):
+        """Write out whatever is still queued and close the log file."""
+        self._log_q.put(None)
+        self._log_thread.join(timeout=5)
+        self._log_f.close()
+
+    def start_webhook_server(self, port: int):
+        """Serve Twilio's keypress callback (/webhook/response) on a background thread."""
+        from flask import Flask, Response, request
+
+        app = Flask(__name__)
+
+        @app.route("/webhook/response", methods=["POST"])
+        def webhook_response():
+            session_id = request.args.get("session", "")
+            digit = request.form.get("Digits", "")
+            if self.deliver_response(session_id, digit):
+                speech = "Got it."
+            else:
+                speech = "That prompt has already closed."
+            return Response(
+                f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<Response><Say voice="alice">{speech}</Say><Hangup /></Response>',
+                mimetype="text/xml",
+            )
 
-        with open(log_file, "a") as f:
-            f.write(json.dumps(log.__dict__) + "\n")
+        threading.Thread(
+            target=app.run,
+            kwargs={"host": "0.0.0.0", "port": port, "use_reloader": False},
+            daemon=True,
+        ).start()
 
     def run(self):
         """Start the monitoring loop."""
-        print(f"\nClaude Code Phone Wrapper")
-        print(f"{'='*40}")
-        print(f"Monitoring pane: {self.pane_id}")
-        print(f"Phone mode: {'enabled' if self.use_phone else 'disabled (local TTS)'}")
-        if self.use_phone:
-            print(f"Phone number: {self.phone_number}")
-        print(f"{'='*40}\n")
-        print("Press Ctrl+C to stop.\n")
+        phone_line = f"Phone number: {self.phone_number}\n" if self.use_phone else ""
+        sys.stdout.write(
+            f"\nClaude Code Phone Wrapper\n"
+            f"{'='*40}\n"
+            f"Monitoring pane: {self.pane_id}\n"
+            f"Phone mode: {'enabled' if self.use_phone else 'disabled (local TTS)'}\n"
+            f"{phone_line}"
+            f"{'='*40}\n\n"
+            "Press Ctrl+C to stop.\n\n"
+        )
+        sys.stdout.flush()
 
         try:
             self.monitor.run(self.handle_event)
         except KeyboardInterrupt:
             print("\nStopping wrapper...")
             print(f"Logged {len(self.logs)} interactions.")
+            if self._log_dropped:
+                print(f"Dropped {self._log_dropped} log entries (writer fell behind).")
 
 
 def main():
-    load_dotenv()
+    load_env()
+    configure_logging()
 
     import argparse
 
@@ -190,6 +358,9 @@ def main():
         use_phone=args.phone,
     )
 
+    if args.phone:
+        wrapper.start_webhook_server(int(os.getenv("WEBHOOK_PORT", "5001")))
+
     wrapper.run()
 
 
@@ -2,17 +2,27 @@
 Twilio integration for making outbound calls with dynamic TwiML.
 """
 
+import functools
 import os
+import queue
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
 from typing import Optional
 
-from twilio.rest import Client
-from twilio.twiml.voice_response import VoiceResponse, Gather
-
+from env import load_env
 from summarizer import Summary
 
+load_env()
+
+# Twilio settings, read once at import
+_TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
+_TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
+_TWILIO_PHONE_FROM = os.getenv("TWILIO_PHONE_FROM")
+_WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL")
+
 
-@dataclass
+@dataclass(slots=True)
 class CallResult:
     call_sid: str
     status: str
@@ -20,6 +30,37 @@ class CallResult:
     response_audio_url: Optional[str] = None
 
 
+# The call's TwiML with only the per-call parts left open. Rendering this is
+# one str.format instead of building and serializing an ElementTree.
+TWIML_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    "<Response>"
+    '<Say voice="alice">{speech}</Say>'
+    '<Gather action="{action}" method="POST" numDigits="1" timeout="30">'
+    '<Say voice="alice">{options}</Say>'
+    "</Gather>"
+    '<Say voice="alice">No input received. The agent will continue waiting.</Say>'
+    "<Hangup />"
+    "</Response>"
+)
+
+# XML text/attribute escaping as one C-level str.translate pass
+_XML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# Set TWILIO_SAFE_MODE=1 to build TwiML with the twilio library instead
+TWILIO_SAFE_MODE = os.getenv("TWILIO_SAFE_MODE") == "1"
+
+
+@functools.lru_cache(maxsize=None)
+def _twilio_client(account_sid: str, auth_token: str):
+    """One shared client per account, so every PhoneCaller reuses its HTTP session."""
+    # Imported here: twilio is only needed once a call is actually placed,
+    # not by local-TTS runs that merely import this module.
+    from twilio.rest import Client
+
+    return Client(account_sid, auth_token)
+
+
 class PhoneCaller:
     """Handles outbound calls via Twilio."""
 
@@ -30,29 +71,36 @@ class PhoneCaller:
         from_number: Optional[str] = None,
         webhook_base_url: Optional[str] = None,
     ):
-        self.account_sid = account_sid or os.getenv("TWILIO_ACCOUNT_SID")
-        self.auth_token = auth_token or os.getenv("TWILIO_AUTH_TOKEN")
-        self.from_number = from_number or os.getenv("TWILIO_PHONE_FROM")
-        self.webhook_base_url = webhook_base_url or os.getenv("WEBHOOK_BASE_URL")
+        self.account_sid = account_sid or _TWILIO_ACCOUNT_SID
+        self.auth_token = auth_token or _TWILIO_AUTH_TOKEN
+        self.from_number = from_number or _TWILIO_PHONE_FROM
+        self.webhook_base_url = webhook_base_url or _WEBHOOK_BASE_URL
 
-        self.client = Client(self.account_sid, self.auth_token)
+        self.client = _twilio_client(self.account_sid, self.auth_token)
 
     def generate_twiml(self, summary: Summary, session_id: str) -> str:
         """Generate TwiML for the call based on the summary."""
+        options_text = summary.dtmf_prompt
+        action = f"{self.webhook_base_url}/webhook/response?session={session_id}"
+
+        if not TWILIO_SAFE_MODE:
+            return TWIML_TEMPLATE.format(
+                speech=summary.speech_text.translate(_XML_ESCAPES),
+                action=action.translate(_XML_ESCAPES),
+                options=options_text.translate(_XML_ESCAPES),
+            )
+
+        from twilio.twiml.voice_response import VoiceResponse, Gather
+
         response = VoiceResponse()
 
         # Speak the summary
         response.say(summary.speech_text, voice="alice")
 
-        # Build options speech
-        options_text = " ".join(
-            f"Press {opt.key} to {opt.label}." for opt in summary.options
-        )
-
         # Gather DTMF input
         gather = Gather(
             num_digits=1,
-            action=f"{self.webhook_base_url}/webhook/response?session={session_id}",
+            action=action,
             method="POST",
             timeout=30,
         )
@@ -87,21 +135,55 @@ class LocalTTSFallback:
     """Local TTS for development without Twilio."""
 
     def __init__(self):
+        # pyttsx3 engines aren't thread-safe (and some drivers need their run
+        # loop on the creating thread), so one speaker thread creates the
+        # engine and does all the talking. Callers queue text with say().
+        self.engine = None
+        self._lines: queue.SimpleQueue = queue.SimpleQueue()
+        self._ready = threading.Event()
+        threading.Thread(target=self._speaker, daemon=True).start()
+        self._ready.wait()
+
+    def _speaker(self):
+        """Speaker thread: own the engine and speak queued lines in order."""
         try:
             import pyttsx3
             self.engine = pyttsx3.init()
             self.engine.setProperty("rate", 180)
         except Exception:
             self.engine = None
+        self._ready.set()
+
+        while True:
+            text, done = self._lines.get()
+            try:
+                if not self.engine:
+                    print(f"\n[TTS] {text}")
+                else:
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+            except Exception as e:
+                done.set_exception(e)
+            else:
+                done.set_result(None)
 
     def speak_and_prompt(self, summary: Summary) -> Optional[str]:
         """Speak the summary and wait for keyboard input."""
-        if not self.engine:
-            print(f"\n[TTS] {summary.speech_text}")
-        else:
-            self.engine.say(summary.speech_text)
-            self.engine.runAndWait()
+        self.speak(summary.speech_text)
+        return self.prompt(summary)
+
+    def say(self, text: str) -> Future:
+        """Queue text to be spoken; the future resolves once it has been."""
+        done: Future = Future()
+        self._lines.put((text, done))
+        return done
 
+    def speak(self, text: str):
+        """Speak text (or print it if no TTS engine is available)."""
+        self.say(text).result()
+
+    def prompt(self, summary: Summary) -> Optional[str]:
+        """Show the summary's options and wait for keyboard input."""
         # Print options
         print("\nOptions:")
         for opt in summary.options:
@@ -116,11 +198,8 @@ class LocalTTSFallback:
 
 
 if __name__ == "__main__":
-    from dotenv import load_dotenv
     from summarizer import SummaryOption
 
-    load_dotenv()
-
     # Test with mock summary
     mock_summary = Summary(
         speech_text="Your tests failed in the auth module. Three tests are broken.",
@@ -138,7 +217,6 @@ if __name__ == "__main__":
     print(f"\nYou chose: {choice}")
 
     # Find matching option
-    for opt in mock_summary.options:
-        if opt.key == choice:
-            print(f"Instruction to send: {opt.instruction}")
-            break
+    opt = mock_summary.by_key.get(choice)
+    if opt:
+        print(f"Instruction to send: {opt.instruction}")
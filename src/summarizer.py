@@ -13,84 +13,295 @@ Uses Claude Agent SDK with custom tools for context gathering:
 """
 
 import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
+import logging
 import os
+import re
+import shutil
 import subprocess
-from dataclasses import dataclass
-from typing import Optional, Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Any
 
-from event_detector import DetectedEvent, EventType
+from env import load_env
+from event_detector import DetectedEvent, EventType, new_event_loop, strip_ansi
+from ttl_cache import TTLCache
 
-# Try to import Agent SDK, fall back to basic Anthropic if not available
+# Use the Agent SDK if it's installed, else fall back to basic Anthropic. Only
+# look for it here: the import itself is deferred to the first summary, so
+# importing this module (or using the no-LLM path) doesn't pay for it.
+AGENT_SDK_AVAILABLE = importlib.util.find_spec("claude_agent_sdk") is not None
+
+log = logging.getLogger("tower")
+
+load_env()
+_ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+
+# A two-sentence JSON summary doesn't need the big model: use the fast one by
+# default and escalate only for events that look hard (see _model_for).
+SUMMARY_MODEL = os.getenv("TOWER_SUMMARY_MODEL", "claude-haiku-4-5")
+ESCALATION_MODEL = os.getenv("TOWER_ESCALATION_MODEL", "claude-sonnet-4-20250514")
+
+# Optional: faster JSON for model responses and the summary cache
 try:
-    from claude_agent_sdk import (
-        query,
-        ClaudeAgentOptions,
-        AssistantMessage,
-        TextBlock,
-        tool,
-        create_sdk_mcp_server,
-    )
-    AGENT_SDK_AVAILABLE = True
+    import orjson
 except ImportError:
-    AGENT_SDK_AVAILABLE = False
-    from anthropic import Anthropic
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so either way the
+# callers catch the same exception.
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
 
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+_JSON_DECODER = json.JSONDecoder()
 
-@dataclass
+
+@dataclass(slots=True)
 class SummaryOption:
     key: str  # DTMF key (1, 2, 3, etc.)
     label: str  # Short label for the option
     instruction: str  # What to send back to Claude Code
 
 
-@dataclass
+@dataclass(slots=True)
 class Summary:
     speech_text: str
     options: list[SummaryOption]
     context_snippet: str
+    # Derived from options once, at construction
+    by_key: dict[str, SummaryOption] = field(init=False, repr=False, compare=False)
+    dtmf_prompt: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.by_key = {opt.key: opt for opt in self.options}
+        self.dtmf_prompt = " ".join(
+            f"Press {opt.key} to {opt.label}." for opt in self.options
+        )
+
+
+@dataclass(slots=True)
+class PartialSummary:
+    """Progress from summarize_streaming: speech first, full summary last."""
+    speech_text: str
+    summary: Optional[Summary] = None  # Set only on the final item
+
+
+# The "speech" string of the response JSON, matched only once its closing
+# quote has streamed in
+_SPEECH_RE = re.compile(r'"speech"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+# The user prompt, pre-split around the per-event fields so building it is
+# a single join rather than an f-string re-render of the whole template.
+_PROMPT_HEAD = "Analyze this terminal output and provide a summary.\n\nEvent type: "
+_PROMPT_KEY_LINES = "\n\nKey lines:\n"
+_PROMPT_OUTPUT = "\n\nFull recent output:\n---\n"
+_PROMPT_GIT_STATUS = "\n---\n\n### Git context\n$ git status --short\n"
+_PROMPT_GIT_DIFF_STAT = "\n$ git diff --stat\n"
+
+# The reply format lives in these per-request tails rather than in
+# SYSTEM_PROMPT, so the cached system prefix is shared by single, tool and
+# batch requests without promising any one of them a different shape.
+_SUMMARY_SHAPE = """{
+  "speech": "Your impressive, specific, actionable summary (2-3 sentences max)",
+  "options": [
+    { "key": "1", "label": "specific action", "instruction": "exact instruction to send to Claude Code" },
+    { "key": "2", "label": "specific action", "instruction": "exact instruction to send to Claude Code" }
+  ]
+}"""
+_PROMPT_TAIL_AGENT_SDK = (
+    "\n\nUse the context tools only if you need more than this (file contents, specific diffs).\n"
+    f"Then respond with JSON only:\n{_SUMMARY_SHAPE}"
+)
+_PROMPT_TAIL_ANTHROPIC = f"\n---\n\nRespond with JSON only:\n{_SUMMARY_SHAPE}"
+_PROMPT_TAIL_EMIT = (
+    "\n---\n\nCall emit_summary with the speech (2-3 sentences max) and the options, "
+    "each a DTMF key, a short label and the exact instruction to send to Claude Code."
+)
+
+# Everything before the key lines depends only on the event type, so it is
+# rendered once per EventType here
+_PROMPT_PREFIXES = {
+    et: f"{_PROMPT_HEAD}{et.value}{_PROMPT_KEY_LINES}" for et in EventType
+}
+_BATCH_EVENT_TYPES = {
+    et: f"\nEvent type: {et.value}{_PROMPT_KEY_LINES}" for et in EventType
+}
+
+
+# Batched prompt: one section per event, output tails shrunk so the whole
+# prompt stays around _BATCH_OUTPUT_BUDGET characters of terminal output
+_BATCH_HEAD = "Analyze the terminal output from each of these events and provide one summary per event.\n"
+_BATCH_TAIL = (
+    '\nRespond with JSON only: {"summaries": [...]}, holding one object per event, '
+    f"in the same order as the events, each shaped like:\n{_SUMMARY_SHAPE}"
+)
+_BATCH_OUTPUT_BUDGET = 12000
+
+
+def _compact_output(text: str) -> str:
+    """
+    Shrink terminal output for a prompt: strip ANSI escapes and trailing
+    whitespace, and collapse runs of identical lines into "<line> (×N)".
+    """
+    lines: list[str] = []
+    prev = None
+    run = 0
+    for line in strip_ansi(text).splitlines():
+        line = line.rstrip()
+        if line == prev:
+            run += 1
+            continue
+        if run > 1 and prev:
+            lines[-1] = f"{prev} (×{run})"
+        lines.append(line)
+        prev = line
+        run = 1
+    if run > 1 and prev:
+        lines[-1] = f"{prev} (×{run})"
+    return "\n".join(lines)
+
+
+def _build_batch_prompt(events: list[DetectedEvent]) -> str:
+    """Build one user prompt covering several events."""
+    tail_chars = max(200, min(1500, _BATCH_OUTPUT_BUDGET // len(events)))
+    parts = [_BATCH_HEAD]
+    for i, event in enumerate(events, 1):
+        parts += (
+            f"\n### Event {i}",
+            _BATCH_EVENT_TYPES[event.event_type],
+            event.key_lines_joined,
+            _PROMPT_OUTPUT,
+            _compact_output(event.raw_tail)[-tail_chars:],
+            "\n---\n",
+        )
+    parts.append(_BATCH_TAIL)
+    return "".join(parts)
+
+
+def _build_prompt(event: DetectedEvent, tail: str) -> str:
+    """Build the user prompt for an event, ending with the given instruction tail."""
+    output = _compact_output(event.raw_tail)
+    if len(output) < len(event.raw_tail):
+        log.debug("Compacted prompt output by %d chars", len(event.raw_tail) - len(output))
+    return "".join((
+        _PROMPT_PREFIXES[event.event_type],
+        event.key_lines_joined,
+        _PROMPT_OUTPUT,
+        output,
+        tail,
+    ))
 
 
 # Tools for context gathering
+# Tool output caches. Entries are keyed on the mtimes that would change the
+# answer, and git results also expire after a few seconds, since editing a
+# tracked file doesn't touch .git/index until it is staged.
+_GIT_CACHE = TTLCache(maxsize=128, ttl=5)
+_FILE_CACHE = TTLCache(maxsize=128)
+
+# Tool output is cut to a couple of KB for the prompt anyway, so only this
+# much of git's output is decoded, and only this much of a file is read.
+_GIT_OUTPUT_CAP = 4096
+_FILE_READ_CAP = 4096
+
+# git resolved once, so each call doesn't search PATH
+_GIT = shutil.which("git") or "git"
+
+
 def run_git_command(args: list[str], cwd: Optional[str] = None) -> str:
     """Run a git command and return output."""
+    cwd = cwd or os.getcwd()
     try:
-        result = subprocess.run(
-            ["git"] + args,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            cwd=cwd or os.getcwd(),
+        key = (tuple(args), cwd, os.stat(os.path.join(cwd, ".git", "index")).st_mtime_ns)
+        if args and args[0] == "status":
+            key += (os.stat(cwd).st_mtime_ns,)  # New untracked files
+    except OSError:
+        key = None  # Not a repo root we can watch - don't cache
+    if key is not None:
+        cached = _GIT_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    try:
+        # Absolute executable, no cwd=, no fd closing (Python's own fds are
+        # non-inheritable already): the arguments that let CPython launch
+        # git with posix_spawn instead of fork + exec.
+        proc = subprocess.Popen(
+            [_GIT, "-C", cwd, *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            close_fds=False,
         )
-        return result.stdout[:2000] if result.stdout else result.stderr[:500]
+        # communicate() drains stdout and stderr together, so git can't
+        # stall on a full stderr pipe, and enforces the deadline itself
+        try:
+            stdout, stderr = proc.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            stdout, stderr = proc.communicate()
+        if stdout:
+            output = stdout[:_GIT_OUTPUT_CAP].decode(errors="replace")[:2000]
+        else:
+            output = stderr.decode(errors="replace")[:500]
     except Exception as e:
         return f"Error: {e}"
 
+    if key is not None:
+        _GIT_CACHE[key] = output
+    return output
 
-def read_file_content(path: str, max_lines: int = 50) -> str:
-    """Read a file's content."""
+
+def read_file_content(path: str, max_lines: int = 50, max_chars: int = _FILE_READ_CAP) -> str:
+    """Read a file's content (its first max_lines lines, at most max_chars)."""
     try:
-        with open(path, 'r') as f:
-            lines = f.readlines()[:max_lines]
-            return ''.join(lines)
+        key = (path, max_lines, max_chars, os.stat(path).st_mtime_ns)
+        cached = _FILE_CACHE.get(key)
+        if cached is not None:
+            return cached
+        # One bounded read, not line iteration: a minified file's single
+        # line could otherwise be megabytes. Undecodable bytes are replaced
+        # so a stray binary file still yields something readable.
+        with open(path, 'r', errors='replace') as f:
+            lines = f.read(max_chars).splitlines(keepends=True)[:max_lines]
+            content = ''.join(lines)
+        _FILE_CACHE[key] = content
+        return content
     except Exception as e:
         return f"Error reading {path}: {e}"
 
 
 # Tool definitions for Agent SDK
-if AGENT_SDK_AVAILABLE:
+def _build_context_server():
+    """MCP server with the context tools (imports the Agent SDK)."""
+    from claude_agent_sdk import create_sdk_mcp_server, tool
+
     @tool("git_status", "Get git status showing changed files", {})
     async def git_status_tool(args: dict[str, Any]) -> dict[str, Any]:
         output = run_git_command(["status", "--short"])
         return {"content": [{"type": "text", "text": output}]}
 
-    @tool("git_diff", "Get git diff showing actual changes", {"file": str})
+    @tool("git_diff", "Get a git diff summary, or one file's changes if a file is given", {"file": str})
     async def git_diff_tool(args: dict[str, Any]) -> dict[str, Any]:
         file_arg = args.get("file", "")
-        cmd = ["diff", "--stat"] if not file_arg else ["diff", file_arg]
+        cmd = ["diff", "--stat", "--find-renames"] if not file_arg else ["diff", file_arg]
         output = run_git_command(cmd)
         return {"content": [{"type": "text", "text": output}]}
 
+    @tool("git_diff_patch", "Get the full git diff patch across all files", {})
+    async def git_diff_patch_tool(args: dict[str, Any]) -> dict[str, Any]:
+        output = run_git_command(["diff", "--find-renames"])
+        return {"content": [{"type": "text", "text": output}]}
+
     @tool("git_log", "Get recent git commits", {"count": int})
     async def git_log_tool(args: dict[str, Any]) -> dict[str, Any]:
         count = min(args.get("count", 5), 10)
@@ -105,6 +316,15 @@ if AGENT_SDK_AVAILABLE:
         content = read_file_content(path)
         return {"content": [{"type": "text", "text": content}]}
 
+    return create_sdk_mcp_server(
+        name="tower-context",
+        version="1.0.0",
+        tools=[
+            git_status_tool, git_diff_tool, git_diff_patch_tool,
+            git_log_tool, read_file_tool,
+        ]
+    )
+
 
 SYSTEM_PROMPT = """You are Tower, an elite AI ops assistant. A developer is monitoring their AI coding agents remotely. They need YOU to translate messy terminal output into crystal-clear, actionable intelligence.
 
@@ -120,7 +340,8 @@ RULES FOR IMPRESSIVE SUMMARIES:
 
 You have tools to gather additional context:
 - git_status: See what files changed
-- git_diff: See the actual code changes
+- git_diff: See which files changed (pass a file to see its actual changes)
+- git_diff_patch: See the full patch, when one file isn't enough
 - git_log: See recent commits
 - read_file: Look at specific files mentioned in errors
 
@@ -132,14 +353,88 @@ GOOD EXAMPLE:
 BAD EXAMPLE:
 "Some tests failed. There were errors in the authentication module."
 
-Respond with JSON only:
-{
-  "speech": "Your impressive, specific, actionable summary (2-3 sentences max)",
-  "options": [
-    { "key": "1", "label": "specific action", "instruction": "exact instruction to send to Claude Code" },
-    { "key": "2", "label": "specific action", "instruction": "exact instruction to send to Claude Code" }
-  ]
-}"""
+Each summary is spoken text plus numbered options the developer can pick with a keypress. Each request says how to return them."""
+
+# SYSTEM_PROMPT as a cacheable prefix for the Messages API: identical on every
+# call, so repeat requests can read it from the prompt cache instead of
+# reprocessing it. (Anthropic only caches prefixes past a minimum token count;
+# below that the marker is simply ignored.)
+_SYSTEM_BLOCKS = [
+    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+]
+
+
+# Forced on non-streaming Messages API calls, so the reply arrives as an
+# already-decoded tool input instead of text that may need unwrapping
+_EMIT_SUMMARY_TOOL = {
+    "name": "emit_summary",
+    "description": "Report the spoken summary and the options to offer the developer.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "speech": {"type": "string"},
+            "options": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "key": {"type": "string", "pattern": "^[0-9]$"},
+                        "label": {"type": "string"},
+                        "instruction": {"type": "string"},
+                    },
+                    "required": ["key", "label", "instruction"],
+                },
+            },
+        },
+        "required": ["speech", "options"],
+    },
+}
+_EMIT_SUMMARY_CHOICE = {"type": "tool", "name": "emit_summary"}
+
+
+# Valid option keys: one DTMF digit
+_DTMF_KEYS = frozenset("0123456789")
+
+# Appended to model replies that leave out a "9" option. Shared between
+# summaries, so it must not be mutated.
+_STOP_OPTION = SummaryOption("9", "stop everything", "Stop immediately and wait for me")
+
+# Markdown fences the model sometimes wraps its JSON reply in
+_MD_JSON_FENCE = "```json"
+_MD_FENCE = "```"
+
+# Speech for _basic_summary, by event type
+_BASIC_SPEECH = {
+    EventType.ERROR: "Error detected in Claude Code session.",
+    EventType.PERMISSION: "Claude Code is waiting for permission.",
+    EventType.STUCK: "Claude Code session appears stuck.",
+    EventType.NORMAL: "Claude Code session update.",
+}
+
+# On-disk summary cache (see Summarizer._cached / _store)
+SUMMARY_CACHE_DIR = Path.home() / ".cache" / "tower" / "summaries"
+SUMMARY_CACHE_MAX = 500
+
+_UNPARSED_SPEECH = "Claude Code needs your attention but I couldn't parse the details."
+
+
+def _event_key(event: DetectedEvent) -> bytes:
+    """Digest of everything the prompt is built from, to spot repeat events."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(event.event_type.value.encode())
+    digest.update(b"\0" + "\n".join(event.key_lines).encode())
+    digest.update(b"\0" + event.raw_tail.encode())
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _anthropic_client(api_key: str):
+    """One shared client per key, so every Summarizer reuses its connection pool."""
+    # Imported on first use - it's a large dependency tree that the Agent SDK
+    # and no-LLM paths never touch.
+    from anthropic import Anthropic
+
+    return Anthropic(api_key=api_key)
 
 
 class Summarizer:
@@ -153,35 +448,221 @@ class Summarizer:
         self.use_agent_sdk = AGENT_SDK_AVAILABLE
         self.client = None
 
+        # Flapping or retrying sessions produce the same event over and over;
+        # reuse the summary instead of paying for another LLM round trip.
+        self._recent: TTLCache = TTLCache(maxsize=64, ttl=60)
+
+        # Test loops repeat the same failure across restarts too, so
+        # summaries are also kept on disk, one JSON file per event digest.
+        self._cache_dir: Optional[Path] = SUMMARY_CACHE_DIR
+        self._cache_writes = 0
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            self._cache_dir = None
+
+        # Prompt-cache hits as reported by the API, to check caching works
+        self.cache_read_tokens = 0
+
+        # Runs the LLM half of summarize_fast()
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+        # Agent SDK queries run on one long-lived event loop (with one MCP
+        # context server) instead of a fresh asyncio.run() per summary.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._context_server = None
+        if self.use_agent_sdk:
+            self._loop = new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
         if not self.use_agent_sdk:
             # Fallback only if SDK not available - requires API key
-            api_key = os.getenv("ANTHROPIC_API_KEY")
+            api_key = _ANTHROPIC_API_KEY
             if api_key:
-                self.client = Anthropic(api_key=api_key)
+                self.client = _anthropic_client(api_key)
             else:
                 print("[Tower] Warning: Agent SDK not available and no ANTHROPIC_API_KEY set")
                 print("[Tower] Install claude-agent-sdk or set ANTHROPIC_API_KEY for summaries")
 
     def summarize(self, event: DetectedEvent) -> Summary:
         """Generate a spoken summary and options for an event."""
+        key = _event_key(event)
+        summary = self._cached(key)
+        if summary is not None:
+            return summary
+
         if self.use_agent_sdk:
-            return asyncio.run(self._summarize_with_agent_sdk(event))
+            summary = asyncio.run_coroutine_threadsafe(
+                self._summarize_with_agent_sdk(event), self._loop
+            ).result()
         elif self.client:
-            return self._summarize_with_anthropic(event)
+            summary = self._summarize_with_anthropic(event)
         else:
             # No LLM available - return basic summary from event data
             return self._basic_summary(event)
 
+        self._store(key, summary)
+        return summary
+
+    def summarize_fast(self, event: DetectedEvent) -> tuple[Summary, "Future[Summary]"]:
+        """
+        Return the canned summary for an event right away, plus a future for
+        the full summarize() result.
+
+        For urgent events: say the canned summary now, and follow up with
+        the full one once it resolves, if it says something different.
+        """
+        return self._basic_summary(event), self._executor.submit(self.summarize, event)
+
+    def close(self):
+        """Stop the Agent SDK event loop thread and the background executor."""
+        self._executor.shutdown(wait=False)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    def summarize_streaming(self, event: DetectedEvent) -> Iterator[PartialSummary]:
+        """
+        Like summarize(), but yields the speech as soon as the model has
+        written it, before the options are complete.
+
+        The last item always carries the parsed Summary. Only the Anthropic
+        API path streams; the other paths yield just that final item.
+        """
+        key = _event_key(event)
+        summary = self._cached(key)
+        if summary is None and (self.use_agent_sdk or not self.client):
+            summary = self.summarize(event)
+        if summary is not None:
+            yield PartialSummary(summary.speech_text, summary)
+            return
+
+        text = ""
+        speech_sent = False
+        prompt = _build_prompt(event, _PROMPT_TAIL_ANTHROPIC)
+        request = self._anthropic_request(prompt, self._model_for(event))
+        with self.client.messages.stream(**request) as stream:
+            for chunk in stream.text_stream:
+                text += chunk
+                if speech_sent:
+                    continue
+                match = _SPEECH_RE.search(text)
+                if match:
+                    speech_sent = True
+                    try:
+                        yield PartialSummary(_json_loads(match.group(1)))
+                    except json.JSONDecodeError:
+                        pass
+
+            self._record_usage(stream.get_final_message().usage)
+
+        summary = self._parse_response(text, event)
+        self._store(key, summary)
+        yield PartialSummary(summary.speech_text, summary)
+
+    def summarize_batch(self, events: list[DetectedEvent]) -> list[Summary]:
+        """
+        Summarize several events, in order, with a single LLM call.
+
+        Events seen recently are answered from the summary cache and left out
+        of the request. Only the Anthropic API path batches; the Agent SDK
+        and no-LLM paths summarize each event on its own.
+        """
+        summaries: list[Optional[Summary]] = [self._cached(_event_key(e)) for e in events]
+        pending = [i for i, summary in enumerate(summaries) if summary is None]
+
+        if len(pending) > 1 and not self.use_agent_sdk and self.client:
+            batch = [events[i] for i in pending]
+            request = self._anthropic_request(
+                _build_batch_prompt(batch), self._model_for(*batch), max_tokens=500 * len(batch)
+            )
+            response = self.client.messages.create(**request)
+            self._record_usage(response.usage)
+
+            data = self._extract_json(response.content[0].text)
+            items = data.get("summaries") if isinstance(data, dict) else None
+            if not isinstance(items, list):
+                print(f"[Tower] Failed to parse batched LLM response: {response.content[0].text[:200]}")
+                items = []
+            for n, i in enumerate(pending):
+                item = items[n] if n < len(items) else None
+                if isinstance(item, dict):
+                    summaries[i] = self._summary_from_data(item, events[i])
+                    self._store(_event_key(events[i]), summaries[i])
+                else:
+                    summaries[i] = self._unparsed_summary(events[i])
+        else:
+            for i in pending:
+                summaries[i] = self.summarize(events[i])
+
+        return summaries
+
+    def _model_for(self, *events: DetectedEvent) -> str:
+        """Pick the summary model: escalate for low-confidence or sprawling errors."""
+        for event in events:
+            if event.confidence < 0.5 or (
+                event.event_type == EventType.ERROR and len(event.key_lines) >= 3
+            ):
+                return ESCALATION_MODEL
+        return SUMMARY_MODEL
+
+    def _cached(self, key: bytes) -> Optional[Summary]:
+        """Look a summary up in memory, then on disk."""
+        summary = self._recent.get(key)
+        if summary is not None or self._cache_dir is None:
+            return summary
+        try:
+            data = _json_loads((self._cache_dir / f"{key.hex()}.json").read_bytes())
+            summary = Summary(
+                speech_text=data["speech_text"],
+                options=[SummaryOption(*opt) for opt in data["options"]],
+                context_snippet=data["context_snippet"],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self._recent[key] = summary
+        return summary
+
+    def _store(self, key: bytes, summary: Summary):
+        """Remember a summary in memory and on disk."""
+        if summary.speech_text == _UNPARSED_SPEECH:
+            return  # A bad reply may be transient - ask again next time
+        self._recent[key] = summary
+        if self._cache_dir is None:
+            return
+        path = self._cache_dir / f"{key.hex()}.json"
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(_json_dumps({
+                "speech_text": summary.speech_text,
+                "options": [[o.key, o.label, o.instruction] for o in summary.options],
+                "context_snippet": summary.context_snippet,
+            }))
+            os.replace(tmp, path)  # Readers never see a half-written file
+        except OSError:
+            return
+
+        self._cache_writes += 1
+        if self._cache_writes % 50 == 0:
+            self._prune_cache()
+
+    def _prune_cache(self):
+        """Keep only the SUMMARY_CACHE_MAX most recently written files."""
+        try:
+            entries = sorted(
+                self._cache_dir.glob("*.json"),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True,
+            )
+            for path in entries[SUMMARY_CACHE_MAX:]:
+                path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
     def _basic_summary(self, event: DetectedEvent) -> Summary:
         """Fallback summary when no LLM is available."""
-        type_messages = {
-            EventType.ERROR: "Error detected in Claude Code session.",
-            EventType.PERMISSION: "Claude Code is waiting for permission.",
-            EventType.STUCK: "Claude Code session appears stuck.",
-            EventType.NORMAL: "Claude Code session update.",
-        }
         return Summary(
-            speech_text=type_messages.get(event.event_type, "Claude Code needs attention."),
+            speech_text=_BASIC_SPEECH.get(event.event_type, "Claude Code needs attention."),
             options=[
                 SummaryOption("1", "approve", "yes"),
                 SummaryOption("2", "retry", "retry"),
@@ -192,74 +673,86 @@ class Summarizer:
 
     async def _summarize_with_agent_sdk(self, event: DetectedEvent) -> Summary:
         """Use Claude Agent SDK with tools for better summaries."""
-        # Create MCP server with context tools
-        context_server = create_sdk_mcp_server(
-            name="tower-context",
-            version="1.0.0",
-            tools=[git_status_tool, git_diff_tool, git_log_tool, read_file_tool]
+        from claude_agent_sdk import query, ClaudeAgentOptions, AssistantMessage, TextBlock
+
+        # MCP server with context tools, created on first use
+        if self._context_server is None:
+            self._context_server = _build_context_server()
+
+        # Fetch the git context the model almost always asks for up front, in
+        # parallel, so most summaries take one model turn instead of a tool
+        # call round trip first.
+        status, diff_stat = await asyncio.gather(
+            asyncio.to_thread(run_git_command, ["status", "--short"]),
+            asyncio.to_thread(run_git_command, ["diff", "--stat"]),
         )
-
-        prompt = f"""Analyze this terminal output and provide a summary.
-
-Event type: {event.event_type.value}
-
-Key lines:
-{chr(10).join(f"- {line}" for line in event.key_lines)}
-
-Full recent output:
----
-{event.raw_output[-2000:]}
----
-
-Use the context tools if you need more information about git changes or file contents.
-Then respond with JSON only (speech and options)."""
+        prompt = _build_prompt(event, "".join((
+            _PROMPT_GIT_STATUS, status, _PROMPT_GIT_DIFF_STAT, diff_stat, _PROMPT_TAIL_AGENT_SDK,
+        )))
 
         options = ClaudeAgentOptions(
             system_prompt=SYSTEM_PROMPT,
-            mcp_servers={"ctx": context_server},
+            mcp_servers={"ctx": self._context_server},
             allowed_tools=[
                 "mcp__ctx__git_status",
                 "mcp__ctx__git_diff",
+                "mcp__ctx__git_diff_patch",
                 "mcp__ctx__git_log",
                 "mcp__ctx__read_file"
             ],
-            max_turns=3,
+            model=self._model_for(event),
+            max_turns=2,  # Room for one tool round trip when the inlined context isn't enough
             max_budget_usd=0.05,  # Cap cost per summary
         )
 
+        # Stop reading as soon as a complete answer has arrived, rather than
+        # waiting out whatever the model adds after it.
         response_text = ""
-        async for message in query(prompt=prompt, options=options):
-            if isinstance(message, AssistantMessage):
+        messages = query(prompt=prompt, options=options)
+        try:
+            async for message in messages:
+                if not isinstance(message, AssistantMessage):
+                    continue
                 for block in message.content:
                     if isinstance(block, TextBlock):
                         response_text += block.text
+                data = self._extract_json(response_text)
+                if data is not None and "speech" in data and "options" in data:
+                    return self._summary_from_data(data, event)
+        finally:
+            await messages.aclose()
 
         return self._parse_response(response_text, event)
 
     def _summarize_with_anthropic(self, event: DetectedEvent) -> Summary:
         """Fallback to basic Anthropic API."""
-        prompt = f"""Analyze this terminal output and provide a summary.
-
-Event type: {event.event_type.value}
-
-Key lines:
-{chr(10).join(f"- {line}" for line in event.key_lines)}
-
-Full recent output:
----
-{event.raw_output[-2000:]}
----
-
-Respond with JSON only (speech and options)."""
-
+        prompt = _build_prompt(event, _PROMPT_TAIL_EMIT)
         response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=500,
-            system=SYSTEM_PROMPT,
+            **self._anthropic_request(prompt, self._model_for(event)),
+            tools=[_EMIT_SUMMARY_TOOL],
+            tool_choice=_EMIT_SUMMARY_CHOICE,
+        )
+        self._record_usage(response.usage)
+
+        for block in response.content:
+            if block.type == "tool_use" and isinstance(block.input, dict):
+                return self._summary_from_data(block.input, event)
+        # No tool call (shouldn't happen with a forced choice): parse any text
+        text = "".join(block.text for block in response.content if block.type == "text")
+        return self._parse_response(text, event)
+
+    def _anthropic_request(self, prompt: str, model: str, max_tokens: int = 500) -> dict:
+        """Build the messages.create / messages.stream arguments for a prompt."""
+        return dict(
+            model=model,
+            max_tokens=max_tokens,
+            system=_SYSTEM_BLOCKS,
             messages=[{"role": "user", "content": prompt}],
         )
 
-        return self._parse_response(response.content[0].text, event)
+    def _record_usage(self, usage):
+        """Tally prompt-cache reads from a Messages API usage block."""
+        self.cache_read_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
 
     def _parse_response(self, text: str, event: DetectedEvent) -> Summary:
         """Parse LLM response into Summary object."""
@@ -267,37 +760,47 @@ Respond with JSON only (speech and options)."""
 
         if data is None:
             print(f"[Tower] Failed to parse LLM response: {text[:200]}")
-            return Summary(
-                speech_text="Claude Code needs your attention but I couldn't parse the details.",
-                options=[
-                    SummaryOption("1", "continue", "Continue with the current task"),
-                    SummaryOption("2", "stop", "Stop and wait for me"),
-                ],
-                context_snippet=event.raw_output[-500:],
-            )
+            return self._unparsed_summary(event)
+
+        return self._summary_from_data(data, event)
+
+    def _unparsed_summary(self, event: DetectedEvent) -> Summary:
+        """Summary for when the model's reply couldn't be understood."""
+        return Summary(
+            speech_text=_UNPARSED_SPEECH,
+            options=[
+                SummaryOption("1", "continue", "Continue with the current task"),
+                SummaryOption("2", "stop", "Stop and wait for me"),
+            ],
+            context_snippet=event.raw_tail[-500:],
+        )
 
+    def _summary_from_data(self, data: dict, event: DetectedEvent) -> Summary:
+        """Build a Summary from one decoded {"speech", "options"} object."""
         # Validate and build options
         options = []
-        for opt in data.get("options", []):
-            key = str(opt.get("key", ""))
-            label = str(opt.get("label", ""))
-            instruction = str(opt.get("instruction", ""))
+        for opt in data.get("options") or ():
+            if not isinstance(opt, dict):
+                continue
+            key = opt.get("key")
+            if not isinstance(key, str):
+                key = str(key)  # The model sometimes sends the digit as a number
 
             # Validate key is a single digit
-            if not key.isdigit() or len(key) != 1:
+            if key not in _DTMF_KEYS:
                 continue
 
             # Skip if missing required fields
+            label = opt.get("label")
+            instruction = opt.get("instruction")
             if not label or not instruction:
                 continue
 
-            options.append(SummaryOption(key=key, label=label, instruction=instruction))
+            options.append(SummaryOption(key, str(label), str(instruction)))
 
         # Always add a "stop" option if not present
         if not any(opt.key == "9" for opt in options):
-            options.append(
-                SummaryOption("9", "stop everything", "Stop immediately and wait for me")
-            )
+            options.append(_STOP_OPTION)
 
         return Summary(
             speech_text=data.get("speech", "Claude Code needs attention."),
@@ -307,46 +810,96 @@ Respond with JSON only (speech and options)."""
 
     def _extract_json(self, text: str) -> Optional[dict]:
         """Extract JSON from LLM response, handling common formatting issues."""
-        # Try direct parse first
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-
         # Strip markdown code blocks
         text = text.strip()
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
+        if text.startswith(_MD_JSON_FENCE):
+            text = text[len(_MD_JSON_FENCE):]
+        elif text.startswith(_MD_FENCE):
+            text = text[len(_MD_FENCE):]
+        if text.endswith(_MD_FENCE):
+            text = text[:-len(_MD_FENCE)]
         text = text.strip()
 
-        # Try again after stripping
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-
-        # Find first { and last } and try to extract
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and end > start:
+        # The usual case: the reply is exactly one JSON object
+        if text.startswith("{") and text.endswith("}"):
             try:
-                return json.loads(text[start:end + 1])
+                data = _json_loads(text)
+                return data if isinstance(data, dict) else None
             except json.JSONDecodeError:
                 pass
 
-        return None
+        # Otherwise decode a single object starting at the first {, ignoring
+        # any prose after it. raw_decode balances the braces itself, so this
+        # is one parse rather than a search for where the object ends.
+        start = text.find("{")
+        if start == -1:
+            return None
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            return None
+        return data if isinstance(data, dict) else None
 
 
-if __name__ == "__main__":
-    # Test with mock event
-    from dotenv import load_dotenv
+class SummaryScheduler:
+    """
+    Coalesce bursts of events into summarize_batch() calls.
 
-    load_dotenv()
+    A submitted event waits until no new event has arrived for idle_ms, or
+    until max_batch events are queued, and is then summarized together with
+    the rest of its burst. Each event's callback receives its Summary on the
+    thread that flushed the batch.
+    """
 
+    def __init__(self, summarizer: Summarizer, idle_ms: int = 500, max_batch: int = 5):
+        self._summarizer = summarizer
+        self._idle = idle_ms / 1000
+        self._max_batch = max_batch
+        self._lock = threading.Lock()
+        self._q: list[tuple[DetectedEvent, Callable[[Summary], Any]]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, event: DetectedEvent, callback: Callable[[Summary], Any]):
+        """Queue an event; callback(summary) runs once its batch is summarized."""
+        with self._lock:
+            self._q.append((event, callback))
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if len(self._q) < self._max_batch:
+                self._timer = threading.Timer(self._idle, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+            batch, self._q = self._q, []
+        self._run(batch)  # Full batch: summarize on the submitting thread
+
+    def _flush(self):
+        with self._lock:
+            batch, self._q = self._q, []
+            self._timer = None
+        if batch:
+            self._run(batch)
+
+    def _run(self, batch: list[tuple[DetectedEvent, Callable[[Summary], Any]]]):
+        events = [event for event, _ in batch]
+        try:
+            summaries = self._summarizer.summarize_batch(events)
+        except Exception:
+            # Every callback still fires: on the timer thread an escaping
+            # error would drop the whole batch, and on a full batch it would
+            # kill the submitter's monitor loop
+            log.exception("Batch summary of %d events failed", len(events))
+            summaries = [self._summarizer._basic_summary(event) for event in events]
+        for (_, callback), summary in zip(batch, summaries):
+            try:
+                callback(summary)
+            except Exception as e:
+                print(f"[Tower] Summary callback failed: {e}")
+
+
+if __name__ == "__main__":
+    # Test with mock event
     mock_event = DetectedEvent(
         event_type=EventType.ERROR,
         raw_output="""
@@ -357,11 +910,11 @@ FAILED tests/test_auth.py::test_password_reset - TimeoutError
 
 3 failed, 12 passed in 4.32s
         """,
-        key_lines=[
+        key_lines=(
             "FAILED tests/test_auth.py::test_login_flow - AssertionError: Expected 200, got 401",
             "FAILED tests/test_auth.py::test_signup - ConnectionError: Database unavailable",
             "3 failed, 12 passed in 4.32s",
-        ],
+        ),
         confidence=0.9,
         timestamp=0,
     )
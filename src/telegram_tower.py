@@ -11,15 +11,20 @@ Setup:
 That's it. No Twilio, no webhooks to configure, no sandbox.
 """
 
+import functools
 import os
 import json
-import subprocess
+import re
 import threading
 import time
 import asyncio
+from collections import namedtuple
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 from telegram import Update
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CommandHandler,
     MessageHandler,
@@ -31,40 +36,100 @@ import pyotp
 # Import our modules
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
+from env import load_env
 from event_detector import (
     TmuxMonitor,
     HooksListener,
+    PaneCache,
     DetectedEvent,
     EventType,
-    capture_tmux_pane,
+    configure_logging,
+    install_uvloop,
+    new_event_loop,
+    last_nonblank_lines,
+    send_keys,
 )
-from summarizer import Summarizer
+from summarizer import Summarizer, Summary, SummaryScheduler
+from ttl_cache import TTLCache
 
 # Config - loaded after dotenv in main()
 TELEGRAM_BOT_TOKEN = ""
 TOTP_SECRET = ""
-TMUX_SESSIONS = []
+TMUX_SESSIONS = ()
 AUTHORIZED_USER_ID = ""
+_TOTP = None  # pyotp.TOTP for TOTP_SECRET, built once in main()
+
+# A configured tmux session. Immutable, so the alerter threads and the bot
+# can share TMUX_SESSIONS without locking.
+_Session = namedtuple("_Session", "name pane")
+
+
+@dataclass(slots=True)
+class UserSession:
+    """An authenticated user."""
+    auth_time: float
+    authenticated: bool = True
+
+
+@dataclass(slots=True)
+class AuthAttempts:
+    """A user's recent failed TOTP attempts."""
+    count: int = 0
+    lockout_until: float = 0.0
 
-# Session state
-user_sessions = {}  # user_id -> session state
-failed_auth_attempts = {}  # user_id -> {"count": int, "lockout_until": float}
-last_permission_session = None  # Track which session last raised a permission event
 
 # Security constants
 MAX_AUTH_ATTEMPTS = 5
 LOCKOUT_SECONDS = 300  # 5 minutes
 
+# Session state
+# user_id -> UserSession. Bounded, and an authentication lapses a day after
+# it was granted, so stale logins don't pile up between /logout calls.
+user_sessions = TTLCache(maxsize=10_000, ttl=24 * 3600)
+# user_id -> AuthAttempts. An entry outlives its last failed attempt by the
+# lockout period - exactly as long as it can matter - and the bound caps what
+# a spray of random user ids can cost.
+failed_auth_attempts = TTLCache(maxsize=10_000, ttl=LOCKOUT_SECONDS)
+last_permission_session = None  # Track which session last raised a permission event
+
+# Status keywords, one case-insensitive pattern per bucket so each check is
+# a single C-level scan with no lowercased copy of the pane. This is the
+# fast path for classification: don't move it to Numba/Cython - JIT string
+# handling falls back to object mode, which is slower than the re engine.
+_ERROR_RE = re.compile(r"error|failed|exception|traceback", re.IGNORECASE)
+_RETRYABLE_RE = re.compile(r"error|failed|exception", re.IGNORECASE)
+_WAITING_RE = re.compile(r"waiting|approve|confirm|y/n", re.IGNORECASE)
+_DONE_RE = re.compile(r"complete|done|finished|pushed|success", re.IGNORECASE)
+
+# A message addressed to a session: "1" for its details, or a command as
+# "1: do something" / "1 do something". Matched with fullmatch.
+_SESSION_MESSAGE_RE = re.compile(r"(\d+)(?:\s*[:\s]\s*(\S.*))?", re.DOTALL)
+
+# Shortcut replies from an authenticated user
+_STATUS_WORDS = frozenset({"status", "s", "sitrep", "?"})
+_APPROVE_WORDS = frozenset({"approve", "yes", "y", "ok", "go"})
+
+# Status report pieces
+_STATUS_HEADER = "📡 *Tower Status Report*\n"
+_STATUS_ROW = "`{i}.` *{name}* — "  # The status is appended per report
+_STATUS_FOOTER = "\n_Reply with a number for details, or send a command._"
+
 # Bot application (set after init)
 bot_app = None
 
+# Pane text as last captured by the alerter's monitors; handlers read from
+# here and only run tmux for panes no monitor has checked in the last few
+# seconds. Those captures are shared briefly, so back-to-back requests don't
+# each run tmux.
+pane_cache = PaneCache()
+
 
 def check_rate_limit(user_id: int) -> tuple[bool, str]:
     """Check if user is rate-limited. Returns (is_allowed, message)."""
-    attempts = failed_auth_attempts.get(user_id, {"count": 0, "lockout_until": 0})
+    attempts = failed_auth_attempts.get(user_id)
 
-    if time.time() < attempts.get("lockout_until", 0):
-        remaining = int(attempts["lockout_until"] - time.time())
+    if attempts is not None and time.time() < attempts.lockout_until:
+        remaining = int(attempts.lockout_until - time.time())
         return False, f"🔒 Locked out. Try again in {remaining}s."
 
     return True, ""
@@ -72,16 +137,16 @@ def check_rate_limit(user_id: int) -> tuple[bool, str]:
 
 def record_failed_auth(user_id: int):
     """Record a failed auth attempt and potentially lock out."""
-    attempts = failed_auth_attempts.get(user_id, {"count": 0, "lockout_until": 0})
+    attempts = failed_auth_attempts.get(user_id)
 
     # Reset if lockout expired
-    if time.time() >= attempts.get("lockout_until", 0):
-        attempts = {"count": 0, "lockout_until": 0}
+    if attempts is None or 0 < attempts.lockout_until <= time.time():
+        attempts = AuthAttempts()
 
-    attempts["count"] += 1
+    attempts.count += 1
 
-    if attempts["count"] >= MAX_AUTH_ATTEMPTS:
-        attempts["lockout_until"] = time.time() + LOCKOUT_SECONDS
+    if attempts.count >= MAX_AUTH_ATTEMPTS:
+        attempts.lockout_until = time.time() + LOCKOUT_SECONDS
         print(f"[Tower] User {user_id} locked out after {MAX_AUTH_ATTEMPTS} failed attempts")
 
     failed_auth_attempts[user_id] = attempts
@@ -94,8 +159,7 @@ def clear_failed_auth(user_id: int):
 
 def verify_totp(code: str) -> bool:
     """Verify TOTP code."""
-    totp = pyotp.TOTP(TOTP_SECRET)
-    return totp.verify(code, valid_window=1)
+    return _TOTP.verify(code, valid_window=1)
 
 
 def is_authorized(user_id: int) -> bool:
@@ -106,30 +170,46 @@ def is_authorized(user_id: int) -> bool:
     return True  # Allow anyone if not configured (they still need TOTP)
 
 
-def get_session_status_text() -> str:
-    """Get current status of all sessions as formatted text."""
-    lines = ["📡 *Tower Status Report*\n"]
+def read_pane(pane: str, lines: int) -> str:
+    """The last lines of a pane, from the cache when possible."""
+    return pane_cache.capture((pane,), lines)[pane]
 
-    for i, session in enumerate(TMUX_SESSIONS, 1):
-        output = capture_tmux_pane(session["pane"], lines=20)
 
-        if not output.strip():
-            status = "⚪ idle"
-        else:
-            output_lower = output.lower()
-            if any(x in output_lower for x in ["error", "failed", "exception", "traceback"]):
-                status = "🔴 error"
-            elif any(x in output_lower for x in ["waiting", "approve", "confirm", "y/n", "[y/n]"]):
-                status = "🟡 waiting"
-            elif any(x in output_lower for x in ["complete", "done", "finished", "pushed", "success"]):
-                status = "🟢 done"
-            else:
-                status = "🔵 working"
+def capture_all_panes(lines: int) -> dict[str, str]:
+    """Every session's pane text keyed by pane ID, capturing uncached panes in one go."""
+    return pane_cache.capture([session.pane for session in TMUX_SESSIONS], lines)
 
-        lines.append(f"`{i}.` *{session['name']}* — {status}")
 
-    lines.append("\n_Reply with a number for details, or send a command._")
-    return "\n".join(lines)
+def pane_status(output: str) -> str:
+    """Classify a pane's recent output for the status report."""
+    if not output or output.isspace():  # Blank pane, without a stripped copy
+        return "⚪ idle"
+    if _ERROR_RE.search(output):
+        return "🔴 error"
+    if _WAITING_RE.search(output):
+        return "🟡 waiting"
+    if _DONE_RE.search(output):
+        return "🟢 done"
+    return "🔵 working"
+
+
+@functools.lru_cache(maxsize=1)
+def _status_rows(sessions: tuple[_Session, ...]) -> tuple[tuple[str, str], ...]:
+    """(pane, rendered row up to the status) per session, built once per session list."""
+    return tuple(
+        (session.pane, _STATUS_ROW.format(i=i, name=session.name))
+        for i, session in enumerate(sessions, 1)
+    )
+
+
+def get_session_status_text() -> str:
+    """Get current status of all sessions as formatted text."""
+    snapshots = capture_all_panes(lines=20)
+    rows = [
+        prefix + pane_status(snapshots[pane])
+        for pane, prefix in _status_rows(TMUX_SESSIONS)
+    ]
+    return "\n".join((_STATUS_HEADER, *rows, _STATUS_FOOTER))
 
 
 def get_session_detail(session_num: int) -> str:
@@ -138,17 +218,15 @@ def get_session_detail(session_num: int) -> str:
         return f"No session {session_num}. I have {len(TMUX_SESSIONS)} active."
 
     session = TMUX_SESSIONS[session_num - 1]
-    output = capture_tmux_pane(session["pane"], lines=40)
+    output = read_pane(session.pane, lines=40)
 
-    # Get last meaningful lines
-    lines = [l.strip() for l in output.split("\n") if l.strip()][-15:]
-    recent = "\n".join(lines) if lines else "(no recent output)"
+    recent = "\n".join(last_nonblank_lines(output, 15)) or "(no recent output)"
 
     # Truncate if too long for Telegram
     if len(recent) > 3000:
         recent = recent[-3000:]
 
-    return f"*Session {session_num}: {session['name']}*\n\n```\n{recent}\n```"
+    return f"*Session {session_num}: {session.name}*\n\n```\n{recent}\n```"
 
 
 def send_to_session(session_num: int, instruction: str) -> str:
@@ -157,17 +235,39 @@ def send_to_session(session_num: int, instruction: str) -> str:
         return f"No session {session_num}."
 
     session = TMUX_SESSIONS[session_num - 1]
-    pane = session["pane"]
 
-    try:
-        subprocess.run(
-            ["tmux", "send-keys", "-t", pane, instruction, "Enter"],
-            check=True,
-            timeout=5,
-        )
-        return f"✅ Sent to *{session['name']}*:\n`{instruction}`"
-    except Exception as e:
-        return f"❌ Failed: {e}"
+    # Through the persistent tmux control client when it's up, so a reply
+    # doesn't fork a tmux process
+    if send_keys(session.pane, instruction):
+        pane_cache.invalidate(session.pane)  # Its output is about to change
+        return f"✅ Sent to *{session.name}*:\n`{instruction}`"
+    return f"❌ Failed to send to *{session.name}* (pane {session.pane})"
+
+
+def approve_waiting_session() -> str:
+    """Send "yes" to the session that last asked for permission, or else to
+    the first one that looks like it's waiting. Returns the reply text."""
+    global last_permission_session
+
+    # Use tracked permission session if available
+    session_num = last_permission_session
+    if session_num is not None and 1 <= session_num <= len(TMUX_SESSIONS):
+        last_permission_session = None  # Clear after use
+        return send_to_session(session_num, "yes")
+
+    # Fallback: scan for waiting session
+    snapshots = capture_all_panes(10)
+    for i, session in enumerate(TMUX_SESSIONS, 1):
+        if _WAITING_RE.search(snapshots[session.pane]):
+            return send_to_session(i, "yes")
+
+    return "No session is waiting for approval."
+
+
+@functools.lru_cache(maxsize=1)
+def get_summarizer() -> Summarizer:
+    """The bot's one Summarizer, shared by /ai and the alerter."""
+    return Summarizer()
 
 
 def get_ai_summary(session_num: int) -> str:
@@ -176,54 +276,48 @@ def get_ai_summary(session_num: int) -> str:
         return f"No session {session_num}."
 
     session = TMUX_SESSIONS[session_num - 1]
-    output = capture_tmux_pane(session["pane"], lines=50)
+    output = read_pane(session.pane, lines=50)
 
     if not output.strip():
-        return f"*{session['name']}* is idle - no recent output."
+        return f"*{session.name}* is idle - no recent output."
 
     # Create a mock event for the summarizer
     event = DetectedEvent(
         event_type=EventType.NORMAL,
         raw_output=output,
-        key_lines=output.strip().split("\n")[-5:],
+        key_lines=tuple(output.rstrip().rsplit("\n", 5)[-5:]),
         confidence=1.0,
         timestamp=time.time(),
     )
 
-    summarizer = Summarizer()
-    summary = summarizer.summarize(event)
+    summary = get_summarizer().summarize(event)
 
-    response = f"*{session['name']}* — AI Summary:\n\n{summary.speech_text}"
+    response = f"*{session.name}* — AI Summary:\n\n{summary.speech_text}"
 
     if summary.options:
-        response += "\n\n*Suggested actions:*"
-        for opt in summary.options[:3]:
-            response += f"\n• `{opt.key}`: {opt.label}"
+        actions = "".join(f"\n• `{opt.key}`: {opt.label}" for opt in summary.options[:3])
+        response = f"{response}\n\n*Suggested actions:*{actions}"
 
     return response
 
 
 # === Telegram Handlers ===
-
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /start command."""
-    user_id = update.effective_user.id
-
-    if not is_authorized(user_id):
-        await update.message.reply_text("🚫 Unauthorized.")
-        return
-
-    await update.message.reply_text(
-        "🗼 *Tower Online*\n\n"
-        "Send your 6-digit code to authenticate.\n\n"
-        "_Your AI agents are standing by._",
-        parse_mode="Markdown"
-    )
+# Anything that talks to tmux or the summarizer runs via asyncio.to_thread,
+# so a slow pane or LLM call doesn't stall every other chat and alert.
+
+def require_auth(handler):
+    """Only run a handler for users who have authenticated with their code."""
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        session = user_sessions.get(update.effective_user.id)
+        if session is None or not session.authenticated:
+            await update.message.reply_text("🔐 Send your 6-digit code first.")
+            return
+        return await handler(update, context)
+    return wrapper
 
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /help command."""
-    help_text = """🗼 *Tower Commands*
+HELP_TEXT = """🗼 *Tower Commands*
 
 *Status*
 `/status` — All session statuses
@@ -245,30 +339,47 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 `2: yes, deploy it`
 `/ai 1` — "What's happening in session 1?"
 """
-    await update.message.reply_text(help_text, parse_mode="Markdown")
+
+UNKNOWN_TEXT = (
+    "Didn't catch that. Try:\n"
+    "• `status` — see all sessions\n"
+    "• `1` — details for session 1\n"
+    "• `1: run tests` — send command\n"
+    "• `/help` — all commands"
+)
 
 
-async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /status command."""
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /start command."""
     user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
 
-    if not session.get("authenticated"):
-        await update.message.reply_text("🔐 Send your 6-digit code first.")
+    if not is_authorized(user_id):
+        await update.message.reply_text("🚫 Unauthorized.")
         return
 
-    await update.message.reply_text(get_session_status_text(), parse_mode="Markdown")
+    await update.message.reply_text(
+        "🗼 *Tower Online*\n\n"
+        "Send your 6-digit code to authenticate.\n\n"
+        "_Your AI agents are standing by._",
+        parse_mode="Markdown"
+    )
+
 
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /help command."""
+    await update.message.reply_text(HELP_TEXT, parse_mode="Markdown")
 
-async def ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /ai command - get AI summary of a session."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
 
-    if not session.get("authenticated"):
-        await update.message.reply_text("🔐 Send your 6-digit code first.")
-        return
+@require_auth
+async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /status command."""
+    status = await asyncio.to_thread(get_session_status_text)
+    await update.message.reply_text(status, parse_mode="Markdown")
+
 
+@require_auth
+async def ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /ai command - get AI summary of a session."""
     # Parse session number from args
     if context.args and context.args[0].isdigit():
         session_num = int(context.args[0])
@@ -277,55 +388,24 @@ async def ai_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     await update.message.reply_text("🤖 Analyzing...", parse_mode="Markdown")
-    summary = get_ai_summary(session_num)
+    summary = await asyncio.to_thread(get_ai_summary, session_num)
     await update.message.reply_text(summary, parse_mode="Markdown")
 
 
+@require_auth
 async def approve_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /approve command."""
-    global last_permission_session
-
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
-
-    if not session.get("authenticated"):
-        await update.message.reply_text("🔐 Send your 6-digit code first.")
-        return
-
-    # Use tracked permission session if available
-    if last_permission_session is not None:
-        session_num = last_permission_session
-        if 1 <= session_num <= len(TMUX_SESSIONS):
-            sess = TMUX_SESSIONS[session_num - 1]
-            result = send_to_session(session_num, "yes")
-            last_permission_session = None  # Clear after use
-            await update.message.reply_text(result, parse_mode="Markdown")
-            return
-
-    # Fallback: scan for waiting session
-    for i, sess in enumerate(TMUX_SESSIONS, 1):
-        output = capture_tmux_pane(sess["pane"], lines=10).lower()
-        if any(x in output for x in ["waiting", "approve", "confirm", "y/n", "[y/n]"]):
-            result = send_to_session(i, "yes")
-            await update.message.reply_text(result, parse_mode="Markdown")
-            return
-
-    await update.message.reply_text("No session is waiting for approval.")
+    result = await asyncio.to_thread(approve_waiting_session)
+    await update.message.reply_text(result, parse_mode="Markdown")
 
 
+@require_auth
 async def retry_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /retry command."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
-
-    if not session.get("authenticated"):
-        await update.message.reply_text("🔐 Send your 6-digit code first.")
-        return
-
+    snapshots = await asyncio.to_thread(capture_all_panes, 10)
     for i, sess in enumerate(TMUX_SESSIONS, 1):
-        output = capture_tmux_pane(sess["pane"], lines=10).lower()
-        if any(x in output for x in ["error", "failed", "exception"]):
-            result = send_to_session(i, "retry")
+        if _RETRYABLE_RE.search(snapshots[sess.pane]):
+            result = await asyncio.to_thread(send_to_session, i, "retry")
             await update.message.reply_text(result, parse_mode="Markdown")
             return
 
@@ -352,10 +432,10 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("🚫 Unauthorized.")
         return
 
-    session = user_sessions.get(user_id, {})
+    session = user_sessions.get(user_id)
 
     # Check if authenticated
-    if not session.get("authenticated"):
+    if session is None or not session.authenticated:
         # Check rate limit first
         allowed, msg = check_rate_limit(user_id)
         if not allowed:
@@ -366,16 +446,15 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if text.isdigit() and len(text) == 6:
             if verify_totp(text):
                 clear_failed_auth(user_id)
-                user_sessions[user_id] = {"authenticated": True, "auth_time": time.time()}
-                status = get_session_status_text()
+                user_sessions[user_id] = UserSession(auth_time=time.time())
+                status = await asyncio.to_thread(get_session_status_text)
                 await update.message.reply_text(
                     f"🔓 *Authenticated*\n\n{status}",
                     parse_mode="Markdown"
                 )
             else:
                 record_failed_auth(user_id)
-                attempts = failed_auth_attempts.get(user_id, {})
-                remaining = MAX_AUTH_ATTEMPTS - attempts.get("count", 0)
+                remaining = MAX_AUTH_ATTEMPTS - failed_auth_attempts[user_id].count
                 await update.message.reply_text(f"❌ Invalid code. {remaining} attempts remaining.")
         else:
             await update.message.reply_text("🔐 Send your 6-digit code to authenticate.")
@@ -385,73 +464,38 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text_lower = text.lower()
 
     # Status shortcuts
-    if text_lower in ["status", "s", "sitrep", "?"]:
-        await update.message.reply_text(get_session_status_text(), parse_mode="Markdown")
-        return
-
-    # Session number for details
-    if text.isdigit() and len(text) <= 2:
-        detail = get_session_detail(int(text))
-        await update.message.reply_text(detail, parse_mode="Markdown")
+    if text_lower in _STATUS_WORDS:
+        status = await asyncio.to_thread(get_session_status_text)
+        await update.message.reply_text(status, parse_mode="Markdown")
         return
 
     # Quick approve
-    if text_lower in ["approve", "yes", "y", "ok", "go"]:
-        global last_permission_session
-
-        # Use tracked permission session if available
-        if last_permission_session is not None:
-            session_num = last_permission_session
-            if 1 <= session_num <= len(TMUX_SESSIONS):
-                result = send_to_session(session_num, "yes")
-                last_permission_session = None
-                await update.message.reply_text(result, parse_mode="Markdown")
-                return
-
-        # Fallback: scan for waiting session
-        for i, sess in enumerate(TMUX_SESSIONS, 1):
-            output = capture_tmux_pane(sess["pane"], lines=10).lower()
-            if any(x in output for x in ["waiting", "approve", "confirm", "y/n"]):
-                result = send_to_session(i, "yes")
-                await update.message.reply_text(result, parse_mode="Markdown")
-                return
-        await update.message.reply_text("No session waiting for approval.")
+    if text_lower in _APPROVE_WORDS:
+        result = await asyncio.to_thread(approve_waiting_session)
+        await update.message.reply_text(result, parse_mode="Markdown")
         return
 
-    # Direct command: "1: do something" or "1 do something"
-    if text[0].isdigit():
-        parts = text.split(":", 1) if ":" in text else text.split(" ", 1)
-        if len(parts) == 2:
-            try:
-                session_num = int(parts[0].strip())
-                instruction = parts[1].strip()
-                if instruction:
-                    result = send_to_session(session_num, instruction)
-                    await update.message.reply_text(result, parse_mode="Markdown")
-                    return
-            except ValueError:
-                pass
+    match = _SESSION_MESSAGE_RE.fullmatch(text)
+    if match:
+        session_num, instruction = match.groups()
+        if instruction is not None:
+            # Direct command: "1: do something" or "1 do something"
+            result = await asyncio.to_thread(send_to_session, int(session_num), instruction)
+            await update.message.reply_text(result, parse_mode="Markdown")
+            return
+        if len(session_num) <= 2:
+            # Session number for details
+            detail = await asyncio.to_thread(get_session_detail, int(session_num))
+            await update.message.reply_text(detail, parse_mode="Markdown")
+            return
 
     # Unknown command
-    await update.message.reply_text(
-        "Didn't catch that. Try:\n"
-        "• `status` — see all sessions\n"
-        "• `1` — details for session 1\n"
-        "• `1: run tests` — send command\n"
-        "• `/help` — all commands",
-        parse_mode="Markdown"
-    )
+    await update.message.reply_text(UNKNOWN_TEXT, parse_mode="Markdown")
 
 
+@require_auth
 async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle voice messages - placeholder for Whisper integration."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
-
-    if not session.get("authenticated"):
-        await update.message.reply_text("🔐 Send your 6-digit code first.")
-        return
-
     # TODO: Download voice file, transcribe with Whisper, process as text
     await update.message.reply_text(
         "🎤 Voice messages coming soon!\n\n"
@@ -472,6 +516,11 @@ async def send_alert(user_id: int, message: str):
         )
 
 
+def _options_text(summary: Summary) -> str:
+    """The reply options listed in an alert, one line each (at most three)."""
+    return "".join(f"• Reply `{opt.key}` — {opt.label}\n" for opt in summary.options[:3])
+
+
 class TelegramAlerter:
     """Monitors sessions and sends Telegram alerts on events.
 
@@ -482,11 +531,21 @@ class TelegramAlerter:
 
     def __init__(self, user_id: int):
         self.user_id = user_id
-        self.summarizer = Summarizer()
+        self.summarizer = get_summarizer()
+        # Tmux and hook events share one scheduler, so a burst is summarized
+        # in a single batch
+        self.scheduler = SummaryScheduler(self.summarizer)
         self.running = False
         self.loop = None
         self.session_name_to_num = {}  # Map session names to numbers
         self.hooks_listener = None
+        # Alerts waiting for the bot loop to send them, in arrival order. A
+        # newer alert for the same source replaces one that hasn't gone out
+        # yet, so a re-triggering session doesn't queue up a stack of them.
+        # Only touched on the loop thread.
+        self._pending_alerts: dict[tuple, str] = {}
+        self._alerts_ready: Optional[asyncio.Event] = None
+        self._alert_task = None
 
     def on_event(self, session_name: str, session_num: int, event: DetectedEvent):
         """Handle detected event - send Telegram alert."""
@@ -496,8 +555,12 @@ class TelegramAlerter:
         if event.event_type == EventType.PERMISSION:
             last_permission_session = session_num
 
-        summary = self.summarizer.summarize(event)
+        self.scheduler.submit(
+            event, lambda summary: self.send_event_alert(session_name, session_num, event, summary)
+        )
 
+    def send_event_alert(self, session_name: str, session_num: int, event: DetectedEvent, summary: Summary):
+        """Send the Telegram alert for a summarized tmux event."""
         # Choose emoji based on event type
         emoji_map = {
             EventType.ERROR: "🔴",
@@ -506,21 +569,14 @@ class TelegramAlerter:
         }
         emoji = emoji_map.get(event.event_type, "🟡")
 
-        message = f"{emoji} *Tower Alert: {session_name}* (session {session_num})\n\n"
-        message += f"{summary.speech_text}\n\n"
-        message += "*Options:*\n"
-
-        for opt in summary.options[:3]:
-            message += f"• Reply `{opt.key}` — {opt.label}\n"
-
-        message += "\n_Or send a custom instruction._"
+        message = (
+            f"{emoji} *Tower Alert: {session_name}* (session {session_num})\n\n"
+            f"{summary.speech_text}\n\n"
+            f"*Options:*\n{_options_text(summary)}"
+            "\n_Or send a custom instruction._"
+        )
 
-        # Schedule the async send in the event loop
-        if self.loop and bot_app:
-            asyncio.run_coroutine_threadsafe(
-                send_alert(self.user_id, message),
-                self.loop
-            )
+        self.queue_alert(("event", session_num), message)
 
     def on_hook_event(self, event: DetectedEvent):
         """Handle event from Claude Code hooks - instant notification."""
@@ -529,41 +585,62 @@ class TelegramAlerter:
         # For hook events, we use session 1 by default (hooks don't tell us which session)
         # In future: could parse session from hook data or use session_id
         session_num = 1
-        session_name = TMUX_SESSIONS[0]["name"] if TMUX_SESSIONS else "unknown"
+        session_name = TMUX_SESSIONS[0].name if TMUX_SESSIONS else "unknown"
 
         # Track permission events for targeted approval
         if event.event_type == EventType.PERMISSION:
             last_permission_session = session_num
 
-        summary = self.summarizer.summarize(event)
-
-        message = f"⚡ *Instant Alert: {session_name}*\n\n"
-        message += f"{summary.speech_text}\n\n"
-        message += "*Options:*\n"
+        self.scheduler.submit(
+            event, lambda summary: self.send_hook_alert(session_name, summary)
+        )
 
-        for opt in summary.options[:3]:
-            message += f"• Reply `{opt.key}` — {opt.label}\n"
+    def send_hook_alert(self, session_name: str, summary: Summary):
+        """Send the Telegram alert for a summarized hook event."""
+        message = (
+            f"⚡ *Instant Alert: {session_name}*\n\n"
+            f"{summary.speech_text}\n\n"
+            f"*Options:*\n{_options_text(summary)}"
+            "\n_Via Claude Code hooks - instant notification!_"
+        )
 
-        message += "\n_Via Claude Code hooks - instant notification!_"
+        self.queue_alert(("hook", session_name), message)
 
-        # Schedule the async send in the event loop
+    def queue_alert(self, source: tuple, message: str):
+        """Hand an alert to the bot loop (from any thread)."""
         if self.loop and bot_app:
-            asyncio.run_coroutine_threadsafe(
-                send_alert(self.user_id, message),
-                self.loop
-            )
+            self.loop.call_soon_threadsafe(self._enqueue_alert, source, message)
+
+    def _enqueue_alert(self, source: tuple, message: str):
+        self._pending_alerts[source] = message
+        self._alerts_ready.set()
+
+    async def _send_alerts(self):
+        """Bot loop task: send queued alerts one at a time."""
+        while True:
+            await self._alerts_ready.wait()
+            self._alerts_ready.clear()
+            while self._pending_alerts:
+                source = next(iter(self._pending_alerts))
+                message = self._pending_alerts.pop(source)
+                try:
+                    await send_alert(self.user_id, message)
+                except Exception as e:
+                    print(f"[Tower] Failed to send alert: {e}")
 
     def start(self, loop):
         """Start monitoring all sessions with hooks + tmux fallback."""
         self.running = True
         self.loop = loop
+        self._alerts_ready = asyncio.Event()
+        self._alert_task = loop.create_task(self._send_alerts())
 
         # Start hooks listener for instant permission detection
         self.hooks_listener = HooksListener(callback=self.on_hook_event)
 
         def run_hooks_listener():
             """Run the async hooks listener in a new event loop."""
-            hooks_loop = asyncio.new_event_loop()
+            hooks_loop = new_event_loop()
             asyncio.set_event_loop(hooks_loop)
             try:
                 hooks_loop.run_until_complete(self.hooks_listener.start())
@@ -579,18 +656,20 @@ class TelegramAlerter:
 
         # Start tmux monitors for error/STUCK detection (fallback)
         for i, session in enumerate(TMUX_SESSIONS, 1):
-            monitor = TmuxMonitor(session["pane"])
+            # Tiered: with many mostly-idle sessions, only the busy ones
+            # poll fast
+            monitor = TmuxMonitor(session.pane, pane_cache=pane_cache, tiered=True)
 
             def make_callback(name, num):
                 return lambda event: self.on_event(name, num, event)
 
             thread = threading.Thread(
                 target=monitor.run,
-                args=(make_callback(session["name"], i),),
+                args=(make_callback(session.name, i),),
                 daemon=True
             )
             thread.start()
-            print(f"[Tower] Monitoring {session['name']} ({session['pane']}) via tmux")
+            print(f"[Tower] Monitoring {session.name} ({session.pane}) via tmux")
 
 
 def print_setup_info(show_secret: bool = False):
@@ -600,10 +679,9 @@ def print_setup_info(show_secret: bool = False):
     print("=" * 60)
 
     if show_secret:
-        totp = pyotp.TOTP(TOTP_SECRET)
         print("\n📱 TOTP Setup:")
         print(f"   Secret: {TOTP_SECRET}")
-        print(f"   Current code: {totp.now()}")
+        print(f"   Current code: {_TOTP.now()}")
     else:
         print("\n📱 TOTP: Configured (run with --setup to see secret)")
 
@@ -612,7 +690,7 @@ def print_setup_info(show_secret: bool = False):
 
     print("\n🖥️  Sessions:")
     for s in TMUX_SESSIONS:
-        print(f"   • {s['name']}: pane {s['pane']}")
+        print(f"   • {s.name}: pane {s.pane}")
 
     print("\n" + "=" * 60)
 
@@ -621,17 +699,20 @@ def main():
     """Run the Telegram bot."""
     global bot_app
 
-    from dotenv import load_dotenv
-    load_dotenv()
+    load_env()
+    configure_logging()
 
     # Check for --setup flag
     show_setup = "--setup" in sys.argv
 
     # Load config after dotenv
-    global TELEGRAM_BOT_TOKEN, TOTP_SECRET, TMUX_SESSIONS, AUTHORIZED_USER_ID
+    global TELEGRAM_BOT_TOKEN, TOTP_SECRET, TMUX_SESSIONS, AUTHORIZED_USER_ID, _TOTP
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
     TOTP_SECRET = os.getenv("TOTP_SECRET", "")
-    TMUX_SESSIONS = json.loads(os.getenv("TMUX_SESSIONS", '[{"name": "main", "pane": "%0"}]'))
+    TMUX_SESSIONS = tuple(
+        _Session(**s)
+        for s in json.loads(os.getenv("TMUX_SESSIONS", '[{"name": "main", "pane": "%0"}]'))
+    )
     AUTHORIZED_USER_ID = os.getenv("TELEGRAM_USER_ID", "")
 
     # Security: require critical config
@@ -650,10 +731,23 @@ def main():
         print("\nTower requires explicit security configuration to run.")
         return
 
+    _TOTP = pyotp.TOTP(TOTP_SECRET)
+
     print_setup_info(show_secret=show_setup)
 
+    # python-telegram-bot runs on the policy's loop, so the bot's polling,
+    # sends and the alerter's cross-thread wakeups all get uvloop
+    install_uvloop()
+
     # Build application
-    bot_app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    builder = Application.builder().token(TELEGRAM_BOT_TOKEN)
+    try:
+        # Queue bursts of alerts under Telegram's ~30 msg/s limit instead of
+        # running into 429 retry-afters (needs the aiolimiter package)
+        builder = builder.rate_limiter(AIORateLimiter(overall_max_rate=25, max_retries=3))
+    except RuntimeError:
+        pass
+    bot_app = builder.build()
 
     # Add handlers
     bot_app.add_handler(CommandHandler("start", start_command))
@@ -0,0 +1,65 @@
+"""
+Bounded in-memory mapping with optional expiry.
+
+Tower keeps per-call and per-user state in plain module-level dicts that are
+never pruned. TTLCache is a drop-in replacement: it holds at most `maxsize`
+entries (least recently used are evicted first) and, if `ttl` is set, forgets
+entries that many seconds after they were last written.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Hashable, Iterator, Optional
+
+
+class TTLCache(MutableMapping):
+    """Thread-safe LRU mapping whose entries expire `ttl` seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            expires_at, value = self._data[key]
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._data[key]
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Hashable):
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            self.expire()
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.expire()
+            return len(self._data)
+
+    def expire(self):
+        """Drop every entry whose ttl has passed."""
+        if self.ttl is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            stale = [k for k, (expires_at, _) in self._data.items() if now >= expires_at]
+            for key in stale:
+                del self._data[key]
@@ -12,40 +12,104 @@ Later: voice message transcription, outbound voice notes
 
 import os
 import json
-import subprocess
+import logging
+import queue
+import re
 import threading
 import time
+from collections import namedtuple
 from datetime import datetime
+from typing import Optional
 from flask import Flask, request, Response
-from twilio.rest import Client
-from twilio.twiml.messaging_response import MessagingResponse
 import pyotp
 
-from event_detector import TmuxMonitor, DetectedEvent, EventType
-from summarizer import Summarizer
+# Optional: serve the webhook with gevent's WSGI server instead of
+# Werkzeug's development server
+try:
+    from gevent.pywsgi import WSGIServer
+except ImportError:
+    WSGIServer = None
+
+from env import load_env
+from event_detector import (
+    PaneCache,
+    TmuxMonitor,
+    DetectedEvent,
+    EventType,
+    configure_logging,
+    last_nonblank_lines,
+    send_keys,
+)
+from summarizer import Summarizer, Summary, SummaryScheduler
+from ttl_cache import TTLCache
+
+log = logging.getLogger("tower")
 
 app = Flask(__name__)
 
 # Twilio client
 twilio_client = None
 
+# Pane text as last captured by the alerter's monitors, or briefly shared
+# between commands for panes no monitor is watching
+pane_cache = PaneCache()
+
 # Session state
-user_sessions = {}  # phone -> session state
-pending_events = {}  # phone -> list of events awaiting response
+# Bounded, and an authentication lapses a day after it was granted. TTLCache
+# locks internally, so the webhook and reply worker threads can share these.
+user_sessions = TTLCache(maxsize=10_000, ttl=24 * 3600)  # phone -> session state
+pending_events = TTLCache(maxsize=10_000, ttl=24 * 3600)  # phone -> list of events awaiting response
+
+# Security constants
+MAX_AUTH_ATTEMPTS = 5
+LOCKOUT_SECONDS = 300  # 5 minutes
+
+# phone -> failed codes in a row. An entry expires LOCKOUT_SECONDS after the
+# last failure, which is what ends a lockout.
+failed_auth_attempts = TTLCache(maxsize=10_000, ttl=LOCKOUT_SECONDS)
 
 # Config
+load_env()
 TOTP_SECRET = os.getenv("TOTP_SECRET", pyotp.random_base32())
-TMUX_SESSIONS = json.loads(os.getenv("TMUX_SESSIONS", '[{"name": "main", "pane": "%0"}]'))
+_TOTP = pyotp.TOTP(TOTP_SECRET)
+# Registered tmux sessions, decoded once at import into immutable records
+_Session = namedtuple("_Session", "name pane")
+TMUX_SESSIONS = tuple(
+    _Session(**s)
+    for s in json.loads(os.getenv("TMUX_SESSIONS", '[{"name": "main", "pane": "%0"}]'))
+)
 YOUR_WHATSAPP = os.getenv("YOUR_WHATSAPP", "")  # Your number: whatsapp:+1234567890
 TWILIO_WHATSAPP = os.getenv("TWILIO_WHATSAPP", "")  # Twilio sandbox: whatsapp:+14155238886
 
 
+# Status keywords, one case-insensitive pattern per bucket so each check is
+# a single C-level scan with no lowercased copy of the pane
+_ERROR_RE = re.compile(r"error|failed|exception", re.IGNORECASE)
+_RETRYABLE_RE = re.compile(r"error|failed", re.IGNORECASE)
+_WAITING_RE = re.compile(r"waiting|approve|confirm|y/n", re.IGNORECASE)
+_DONE_RE = re.compile(r"complete|done|finished|pushed", re.IGNORECASE)
+
+
+# A message addressed to a session: "1" for its details, or a command as
+# "1: do something" / "1 do something". Matched with fullmatch.
+_SESSION_MESSAGE_RE = re.compile(r"(\d+)(?:\s*[:\s]\s*(\S.*))?", re.DOTALL)
+
+
 def get_twilio_client():
     global twilio_client
     if twilio_client is None:
+        # Imported here: Twilio's REST client pulls in a large HTTP stack
+        # that /health, the setup printout and the webhook never need
+        from twilio.http.http_client import TwilioHttpClient
+        from twilio.rest import Client
+
+        # One pooled keep-alive session for every send, so alerts and
+        # replies after the first skip the TCP/TLS handshake. Retries only
+        # cover failures to connect, so a message is never sent twice.
         twilio_client = Client(
             os.getenv("TWILIO_ACCOUNT_SID"),
-            os.getenv("TWILIO_AUTH_TOKEN")
+            os.getenv("TWILIO_AUTH_TOKEN"),
+            http_client=TwilioHttpClient(pool_connections=True, max_retries=3),
         )
     return twilio_client
 
@@ -58,58 +122,55 @@ def send_whatsapp(to: str, message: str):
         to=to,
         body=message
     )
-    print(f"[Tower → WhatsApp] {message[:100]}...")
+    log.info("→ WhatsApp %s: %s...", to, message[:100])
 
 
 def verify_totp(code: str) -> bool:
     """Verify TOTP code."""
-    totp = pyotp.TOTP(TOTP_SECRET)
-    return totp.verify(code, valid_window=1)
+    return _TOTP.verify(code, valid_window=1)
 
 
-def get_session_status_text() -> str:
-    """Get current status of all sessions as text."""
-    from event_detector import capture_tmux_pane
+def capture_all_panes(lines: int) -> dict[str, str]:
+    """Every session's pane text keyed by pane ID, capturing uncached panes in one go."""
+    return pane_cache.capture([session.pane for session in TMUX_SESSIONS], lines)
 
-    lines = ["📡 *Tower Status Report*\n"]
 
-    for i, session in enumerate(TMUX_SESSIONS, 1):
-        output = capture_tmux_pane(session["pane"], lines=20)
+def pane_status(output: str) -> str:
+    """Classify a pane's recent output for the status report."""
+    if not output or output.isspace():
+        return "⚪ idle"
+    if _ERROR_RE.search(output):
+        return "🔴 error"
+    if _WAITING_RE.search(output):
+        return "🟡 waiting for input"
+    if _DONE_RE.search(output):
+        return "🟢 completed"
+    return "🔵 working"
 
-        if not output.strip():
-            status = "⚪ idle"
-        else:
-            output_lower = output.lower()
-            if any(x in output_lower for x in ["error", "failed", "exception"]):
-                status = "🔴 error"
-            elif any(x in output_lower for x in ["waiting", "approve", "confirm", "y/n"]):
-                status = "🟡 waiting for input"
-            elif any(x in output_lower for x in ["complete", "done", "finished", "pushed"]):
-                status = "🟢 completed"
-            else:
-                status = "🔵 working"
 
-        lines.append(f"{i}. *{session['name']}* - {status}")
-
-    lines.append("\n_Reply with a number for details, or a command._")
-    return "\n".join(lines)
+def get_session_status_text() -> str:
+    """Get current status of all sessions as text."""
+    snapshots = capture_all_panes(lines=20)
+    rows = "\n".join(
+        f"{i}. *{session.name}* - {pane_status(snapshots[session.pane])}"
+        for i, session in enumerate(TMUX_SESSIONS, 1)
+    )
+    return f"📡 *Tower Status Report*\n\n{rows}\n\n_Reply with a number for details, or a command._"
 
 
 def get_session_detail(session_num: int) -> str:
     """Get detailed status for a specific session."""
-    from event_detector import capture_tmux_pane
-
     if session_num < 1 or session_num > len(TMUX_SESSIONS):
         return f"No session {session_num}. I have {len(TMUX_SESSIONS)} sessions."
 
     session = TMUX_SESSIONS[session_num - 1]
-    output = capture_tmux_pane(session["pane"], lines=30)
+    output = pane_cache.capture((session.pane,), lines=30)[session.pane]
 
-    # Get last meaningful lines
-    lines = [l.strip() for l in output.split("\n") if l.strip()][-10:]
-    recent = "\n".join(lines) if lines else "(no recent output)"
+    recent = "\n".join(last_nonblank_lines(output, 10)) or "(no recent output)"
+    if len(recent) > 1000:
+        recent = recent[:1000]
 
-    return f"*Session {session_num}: {session['name']}*\n\n```\n{recent[:1000]}\n```"
+    return f"*Session {session_num}: {session.name}*\n\n```\n{recent}\n```"
 
 
 def send_to_session(session_num: int, instruction: str) -> str:
@@ -118,17 +179,37 @@ def send_to_session(session_num: int, instruction: str) -> str:
         return f"No session {session_num}."
 
     session = TMUX_SESSIONS[session_num - 1]
-    pane = session["pane"]
 
-    try:
-        subprocess.run(
-            ["tmux", "send-keys", "-t", pane, instruction, "Enter"],
-            check=True,
-            timeout=5,
-        )
-        return f"✅ Sent to {session['name']}: `{instruction}`"
-    except Exception as e:
-        return f"❌ Failed to send: {e}"
+    # Through the persistent tmux control client when it's up, so a reply
+    # doesn't fork a tmux process
+    if send_keys(session.pane, instruction):
+        pane_cache.invalidate(session.pane)  # Its output is about to change
+        return f"✅ Sent to {session.name}: `{instruction}`"
+    return f"❌ Failed to send to {session.name} (pane {session.pane})"
+
+
+# Command words, matched against the whole lowercased message
+_STATUS_WORDS = frozenset({"status", "s", "sitrep", "report", "?"})
+_APPROVE_WORDS = frozenset({"approve", "yes", "y", "continue", "go", "ok"})
+_RETRY_WORDS = frozenset({"retry", "again", "rerun"})
+_STOP_WORDS = frozenset({"stop", "abort", "cancel", "kill"})
+_HELP_WORDS = frozenset({"help", "h", "commands", "?"})
+_LOGOUT_WORDS = frozenset({"logout", "bye", "exit"})
+
+HELP_TEXT = """*Tower Commands*
+
+📊 *Status*
+`status` - Get all session statuses
+`1`, `2`, etc - Get details for session
+
+✅ *Actions*
+`approve` - Approve waiting session
+`retry` - Retry failed session
+`1: <instruction>` - Send command to session 1
+
+🔄 *Other*
+`help` - This message
+`logout` - End session"""
 
 
 def handle_command(phone: str, text: str) -> str:
@@ -138,12 +219,20 @@ def handle_command(phone: str, text: str) -> str:
 
     # Check if authenticated
     if not session.get("authenticated"):
+        failures = failed_auth_attempts.get(phone, 0)
+        if failures >= MAX_AUTH_ATTEMPTS:
+            return "🔒 Too many attempts. Try again in a few minutes."
+
         # Check if this is a TOTP code
         if text.isdigit() and len(text) == 6:
             if verify_totp(text):
+                failed_auth_attempts.pop(phone, None)
                 user_sessions[phone] = {"authenticated": True, "auth_time": time.time()}
                 return "🔓 Authenticated.\n\n" + get_session_status_text()
             else:
+                failed_auth_attempts[phone] = failures + 1
+                if failures + 1 >= MAX_AUTH_ATTEMPTS:
+                    log.warning("%s locked out after %d failed attempts", phone, MAX_AUTH_ATTEMPTS)
                 return "❌ Invalid code. Try again."
         else:
             return "🔐 Tower here. Send your 6-digit code to authenticate."
@@ -151,66 +240,45 @@ def handle_command(phone: str, text: str) -> str:
     # Authenticated - process commands
 
     # Status request
-    if text_lower in ["status", "s", "sitrep", "report", "?"]:
+    if text_lower in _STATUS_WORDS:
         return get_session_status_text()
 
-    # Session number for details
-    if text.isdigit():
-        return get_session_detail(int(text))
+    match = _SESSION_MESSAGE_RE.fullmatch(text)
+    if match:
+        session_num, instruction = match.groups()
+        if instruction is None:
+            # Session number for details
+            return get_session_detail(int(session_num))
+        # Direct command: "1: do something" or "1 do something"
+        return send_to_session(int(session_num), instruction)
 
     # Approve/continue
-    if text_lower in ["approve", "yes", "y", "continue", "go", "ok"]:
+    if text_lower in _APPROVE_WORDS:
         # Find session waiting for input
+        snapshots = capture_all_panes(lines=10)
         for i, sess in enumerate(TMUX_SESSIONS, 1):
-            from event_detector import capture_tmux_pane
-            output = capture_tmux_pane(sess["pane"], lines=10).lower()
-            if any(x in output for x in ["waiting", "approve", "confirm", "y/n"]):
+            if _WAITING_RE.search(snapshots[sess.pane]):
                 return send_to_session(i, "yes")
         return "No session is waiting for approval."
 
     # Retry
-    if text_lower in ["retry", "again", "rerun"]:
+    if text_lower in _RETRY_WORDS:
+        snapshots = capture_all_panes(lines=10)
         for i, sess in enumerate(TMUX_SESSIONS, 1):
-            from event_detector import capture_tmux_pane
-            output = capture_tmux_pane(sess["pane"], lines=10).lower()
-            if any(x in output for x in ["error", "failed"]):
+            if _RETRYABLE_RE.search(snapshots[sess.pane]):
                 return send_to_session(i, "retry")
         return "No session has errors to retry."
 
     # Stop/abort
-    if text_lower in ["stop", "abort", "cancel", "kill"]:
+    if text_lower in _STOP_WORDS:
         return "Which session? Reply with the number."
 
-    # Direct command: "1: do something" or "1 do something"
-    if text[0].isdigit():
-        parts = text.split(":", 1) if ":" in text else text.split(" ", 1)
-        if len(parts) == 2:
-            try:
-                session_num = int(parts[0].strip())
-                instruction = parts[1].strip()
-                return send_to_session(session_num, instruction)
-            except ValueError:
-                pass
-
     # Help
-    if text_lower in ["help", "h", "commands", "?"]:
-        return """*Tower Commands*
-
-📊 *Status*
-`status` - Get all session statuses
-`1`, `2`, etc - Get details for session
-
-✅ *Actions*
-`approve` - Approve waiting session
-`retry` - Retry failed session
-`1: <instruction>` - Send command to session 1
-
-🔄 *Other*
-`help` - This message
-`logout` - End session"""
+    if text_lower in _HELP_WORDS:
+        return HELP_TEXT
 
     # Logout
-    if text_lower in ["logout", "bye", "exit"]:
+    if text_lower in _LOGOUT_WORDS:
         user_sessions.pop(phone, None)
         return "👋 Logged out. Send your code to reconnect."
 
@@ -225,19 +293,45 @@ def whatsapp_webhook():
     body = request.form.get("Body", "").strip()
     media_url = request.form.get("MediaUrl0", "")  # Voice message URL
 
-    print(f"[WhatsApp → Tower] {from_number}: {body[:100]}")
+    log.info("WhatsApp → %s: %s", from_number, body[:100])
 
-    # TODO: Handle voice messages (transcribe with Whisper)
-    if media_url:
-        response_text = "🎤 Voice messages coming soon. Please send text for now."
-    else:
-        response_text = handle_command(from_number, body)
+    # Answered out-of-band by the reply worker: handling a command can take
+    # tmux captures and sends, and Twilio wants the webhook back quickly
+    try:
+        inbound_messages.put_nowait((from_number, body, media_url))
+    except queue.Full:
+        # Flooded - turn the message away at once rather than queue it
+        return Response(_BUSY_TWIML, mimetype="text/xml")
+
+    # The reply goes out through the REST API, so this is always empty
+    return Response(_EMPTY_TWIML, mimetype="text/xml")
+
+
+_EMPTY_TWIML = '<?xml version="1.0" encoding="UTF-8"?><Response />'
+_BUSY_TWIML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    "<Response><Message>⏳ Tower is busy. Try again in a moment.</Message></Response>"
+)
+
+
+def reply_worker():
+    """Answer queued inbound messages in arrival order, via the Twilio API."""
+    while True:
+        from_number, body, media_url = inbound_messages.get()
+        try:
+            # TODO: Handle voice messages (transcribe with Whisper)
+            if media_url:
+                response_text = "🎤 Voice messages coming soon. Please send text for now."
+            else:
+                response_text = handle_command(from_number, body)
+            send_whatsapp(from_number, response_text)
+        except Exception as e:
+            log.warning("Failed to answer %s: %s", from_number, e)
 
-    # Send response
-    resp = MessagingResponse()
-    resp.message(response_text)
 
-    return Response(str(resp), mimetype="text/xml")
+# (from, body, media URL) of messages the webhook has accepted but not answered
+inbound_messages: queue.Queue = queue.Queue(maxsize=1000)
+threading.Thread(target=reply_worker, daemon=True).start()
 
 
 @app.route("/health", methods=["GET"])
@@ -246,56 +340,95 @@ def health():
     return {"status": "ok", "sessions": len(TMUX_SESSIONS)}
 
 
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Queue depth, for scraping."""
+    return {"inbound_queue": inbound_messages.qsize(), "inbound_queue_max": inbound_messages.maxsize}
+
+
 # === Outbound alerts (Tower → You) ===
 
+def _alert_text(session_name: str, event: DetectedEvent, summary: Summary) -> str:
+    """One event's alert: what happened and the replies on offer."""
+    emoji = "🔴" if event.event_type == EventType.ERROR else "🟡"
+    options = "".join(f"\n• Reply `{opt.key}` to {opt.label}" for opt in summary.options)
+    return f"{emoji} *Tower Alert: {session_name}*\n\n{summary.speech_text}\n\n*Options:*{options}"
+
+
 class WhatsAppAlerter:
     """Monitors sessions and sends WhatsApp alerts on events."""
 
+    # Alerts ready within this window of each other go out as one message
+    BATCH_WINDOW = 0.5  # seconds
+    MAX_BATCH = 5
+
     def __init__(self, target_phone: str):
         self.target_phone = target_phone
         self.summarizer = Summarizer()
+        # Events from every monitor share one scheduler, so a burst across
+        # sessions is summarized in a single batch
+        self.scheduler = SummaryScheduler(self.summarizer)
         self.monitors = []
         self.running = False
+        self._alerts: list[tuple[str, DetectedEvent, Summary]] = []
+        self._alerts_lock = threading.Lock()
+        self._alerts_timer: Optional[threading.Timer] = None
 
     def on_event(self, session_name: str, event: DetectedEvent):
-        """Handle detected event - send WhatsApp alert."""
-        # Generate summary
-        summary = self.summarizer.summarize(event)
-
-        # Build message
-        emoji = "🔴" if event.event_type == EventType.ERROR else "🟡"
-
-        message = f"""{emoji} *Tower Alert: {session_name}*
-
-{summary.speech_text}
-
-*Options:*
-"""
-        for opt in summary.options:
-            message += f"• Reply `{opt.key}` to {opt.label}\n"
-
-        message += "\n_Or reply with a custom instruction._"
+        """Handle detected event - queue it for a WhatsApp alert."""
+        self.scheduler.submit(
+            event, lambda summary: self.send_alert(session_name, event, summary)
+        )
 
-        send_whatsapp(self.target_phone, message)
+    def send_alert(self, session_name: str, event: DetectedEvent, summary: Summary):
+        """Queue the WhatsApp alert for a summarized event."""
+        with self._alerts_lock:
+            self._alerts.append((session_name, event, summary))
+            if len(self._alerts) < self.MAX_BATCH:
+                if self._alerts_timer is None:
+                    self._alerts_timer = threading.Timer(self.BATCH_WINDOW, self._flush_alerts)
+                    self._alerts_timer.daemon = True
+                    self._alerts_timer.start()
+                return
+        self._flush_alerts()  # Full batch: send now
+
+    def _flush_alerts(self):
+        """Send every queued alert as one WhatsApp message."""
+        with self._alerts_lock:
+            alerts, self._alerts = self._alerts, []
+            if self._alerts_timer is not None:
+                self._alerts_timer.cancel()
+                self._alerts_timer = None
+        if not alerts:
+            return
+
+        if len(alerts) == 1:
+            body = _alert_text(*alerts[0])
+        else:
+            worst = "🔴" if any(event.event_type == EventType.ERROR for _, event, _ in alerts) else "🟡"
+            body = f"{worst} *Tower: {len(alerts)} alerts*\n\n" + "\n\n".join(
+                _alert_text(*alert) for alert in alerts
+            )
+        send_whatsapp(self.target_phone, f"{body}\n\n_Or reply with a custom instruction._")
 
     def start(self):
         """Start monitoring all sessions."""
         self.running = True
 
         for session in TMUX_SESSIONS:
-            monitor = TmuxMonitor(session["pane"])
+            monitor = TmuxMonitor(session.pane, pane_cache=pane_cache)
 
             def make_callback(name):
                 return lambda event: self.on_event(name, event)
 
             thread = threading.Thread(
                 target=monitor.run,
-                args=(make_callback(session["name"]),),
+                args=(make_callback(session.name),),
                 daemon=True
             )
             thread.start()
             self.monitors.append((monitor, thread))
-            print(f"[Tower] Monitoring {session['name']} ({session['pane']})")
+            log.info("Monitoring %s (%s)", session.name, session.pane)
 
     def stop(self):
         self.running = False
@@ -303,15 +436,13 @@ class WhatsAppAlerter:
 
 def print_setup_info():
     """Print setup instructions."""
-    totp = pyotp.TOTP(TOTP_SECRET)
-
     print("\n" + "=" * 60)
     print("TOWER - WhatsApp Edition")
     print("=" * 60)
 
     print("\n📱 TOTP Setup:")
     print(f"   Secret: {TOTP_SECRET}")
-    print(f"   Current code: {totp.now()}")
+    print(f"   Current code: {_TOTP.now()}")
 
     print("\n📲 Twilio WhatsApp Sandbox:")
     print("   1. Go to: https://console.twilio.com/us1/develop/sms/try-it-out/whatsapp-learn")
@@ -320,14 +451,14 @@ def print_setup_info():
 
     print("\n🖥️  Sessions:")
     for s in TMUX_SESSIONS:
-        print(f"   • {s['name']}: pane {s['pane']}")
+        print(f"   • {s.name}: pane {s.pane}")
 
     print("\n" + "=" * 60)
 
 
 if __name__ == "__main__":
-    from dotenv import load_dotenv
-    load_dotenv()
+    # TOWER_LOG_LEVEL=WARNING drops the per-message lines entirely
+    configure_logging(os.getenv("TOWER_LOG_LEVEL", "INFO").upper())
 
     print_setup_info()
 
@@ -335,9 +466,12 @@ if __name__ == "__main__":
     if YOUR_WHATSAPP:
         alerter = WhatsAppAlerter(YOUR_WHATSAPP)
         alerter.start()
-        print(f"\n[Tower] Alerts will go to: {YOUR_WHATSAPP}")
+        log.info("Alerts will go to: %s", YOUR_WHATSAPP)
     else:
-        print("\n[Tower] No YOUR_WHATSAPP set - inbound only mode")
+        log.info("No YOUR_WHATSAPP set - inbound only mode")
 
-    print("\n[Tower] Starting webhook server on :5000...")
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    log.info("Starting webhook server on :5000...")
+    if WSGIServer is not None:
+        WSGIServer(("0.0.0.0", 5000), app).serve_forever()
+    else:
+        app.run(host="0.0.0.0", port=5000, debug=False)